@@ -0,0 +1,189 @@
+"""ADMX/ADML policy definitions index for GPOAnalyzer."""
+# gpoanalyzer/admx.py
+
+import hashlib
+import json
+import os
+import xml.etree.ElementTree as ET
+
+CACHE_VERSION = 2
+
+# Elements of a policy definition that write registry values
+VALUE_ELEMENTS = ("boolean", "decimal", "longDecimal", "enum", "text", "multiText")
+
+
+def normalize_key(key: str) -> str:
+    """Normalize a registry key for case-insensitive lookups."""
+    return key.strip("\\").lower()
+
+
+def definition_name(file_path: str) -> str:
+    """Return the base name shared by an ADMX file and its ADML files."""
+    return os.path.splitext(os.path.basename(file_path))[0].lower()
+
+
+def default_cache_dir() -> str:
+    """Return the directory used to cache policy definitions indexes."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "gpoanalyzer")
+
+
+class PolicyIndex:
+    """Lookup index mapping registry keys and values to policy names.
+
+    The index is built from the ADMX files of a PolicyDefinitions folder and
+    the ADML files of one language, and cached on disk. The cache is reused
+    as long as no ADMX or ADML file was added, removed or modified.
+    """
+
+    def __init__(self, definitions_path: str, language: str = "en-US",
+                 cache_dir: str = None) -> None:
+        """Initialize the PolicyIndex instance and load or build the index.
+
+        Args:
+            definitions_path (str): The path to the PolicyDefinitions folder.
+            language (str): The ADML language used to resolve display names.
+            cache_dir (str): The directory of the on-disk cache.
+        """
+        self.definitions_path = definitions_path
+        self.language = language
+        self.cache_dir = cache_dir or default_cache_dir()
+        # "key\0value" -> [display name, policy name, ADMX file]
+        self.index = {}
+        self.load()
+
+    def definition_files(self) -> list:
+        """List the ADMX files and the ADML files of the selected language."""
+        files = []
+        language_dir = None
+
+        for entry in os.scandir(self.definitions_path):
+            if entry.is_file() and entry.name.lower().endswith(".admx"):
+                files.append(entry.path)
+            elif entry.is_dir() and entry.name.lower() == self.language.lower():
+                language_dir = entry.path
+
+        if language_dir:
+            for entry in os.scandir(language_dir):
+                if entry.is_file() and entry.name.lower().endswith(".adml"):
+                    files.append(entry.path)
+
+        return sorted(files)
+
+    def signature(self, files: list) -> str:
+        """Hash the names, sizes and mtimes of the definition files."""
+        digest = hashlib.sha256(self.language.lower().encode("utf-8"))
+        for file_path in files:
+            stat = os.stat(file_path)
+            digest.update(f"{file_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def cache_path(self) -> str:
+        """Return the cache file of the current PolicyDefinitions folder."""
+        folder = os.path.abspath(self.definitions_path).encode("utf-8")
+        return os.path.join(self.cache_dir,
+                            f"admx-{hashlib.sha256(folder).hexdigest()[:16]}.json")
+
+    def load(self):
+        """Load the index from the cache, rebuilding it if the folder changed."""
+        files = self.definition_files()
+        signature = self.signature(files)
+        cache_path = self.cache_path()
+
+        try:
+            with open(cache_path, "r", encoding="utf-8") as file:
+                cache = json.load(file)
+            if cache.get("version") == CACHE_VERSION and cache.get("signature") == signature:
+                self.index = cache["index"]
+                return
+        except (OSError, ValueError):
+            pass
+
+        self.build(files)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as file:
+                json.dump({"version": CACHE_VERSION, "signature": signature,
+                           "index": self.index}, file, separators=(",", ":"))
+        except OSError as e:
+            print("An exception occurred while writing the ADMX cache:", e)
+
+    def build(self, files: list):
+        """Build the index from the given ADMX and ADML files."""
+        # String ids are only unique within an ADML file, so each ADMX file
+        # is resolved against the ADML file of the same name
+        strings = {}
+        for file_path in files:
+            if file_path.lower().endswith(".adml"):
+                strings[definition_name(file_path)] = self.read_adml(file_path)
+
+        self.index = {}
+        for file_path in files:
+            if file_path.lower().endswith(".admx"):
+                self.read_admx(file_path, strings.get(definition_name(file_path), {}))
+
+    @staticmethod
+    def read_adml(file_path: str) -> dict:
+        """Read the string table of an ADML file."""
+        try:
+            root = ET.parse(file_path).getroot()
+        except (OSError, ET.ParseError):
+            return {}
+        return {string.get("id"): (string.text or "").strip()
+                for string in root.iterfind(".//{*}string")}
+
+    def read_admx(self, file_path: str, strings: dict):
+        """Add the registry values written by the policies of an ADMX file.
+
+        Args:
+            file_path (str): The path of the ADMX file.
+            strings (dict): The string table of its ADML file.
+        """
+        try:
+            root = ET.parse(file_path).getroot()
+        except (OSError, ET.ParseError):
+            return
+
+        admx_name = os.path.basename(file_path)
+
+        for policy in root.iterfind(".//{*}policy"):
+            display_name = policy.get("displayName", "")
+            if display_name.startswith("$(string.") and display_name.endswith(")"):
+                display_name = strings.get(display_name[9:-1], display_name)
+            entry = [display_name, policy.get("name", ""), admx_name]
+            policy_key = policy.get("key", "")
+
+            # The policy value itself, then the values of its elements and of
+            # its enabled/disabled lists. List elements write arbitrary value
+            # names, so they are indexed by key alone.
+            for element in policy.iter():
+                tag = element.tag.rsplit("}", 1)[-1]
+                key = element.get("key", policy_key)
+                if tag == "list":
+                    self.add(key, "", entry)
+                elif element.get("valueName") and tag in ("policy", "item") + VALUE_ELEMENTS:
+                    self.add(key, element.get("valueName"), entry)
+
+    def add(self, key: str, value_name: str, entry: list):
+        """Add a registry value to the index, keeping the first definition."""
+        if key:
+            self.index.setdefault(f"{normalize_key(key)}\0{value_name.lower()}", entry)
+
+    def lookup(self, key: str, value_name: str):
+        """Return the [display name, policy name, ADMX file] of a registry value.
+
+        Values written by list elements have arbitrary names, so the key
+        alone is looked up when the exact value is not defined.
+        """
+        key = normalize_key(key)
+        return (self.index.get(f"{key}\0{value_name.lower()}")
+                or self.index.get(f"{key}\0"))
+
+    def annotate(self, rows: dict):
+        """Add the policy name to each Registry.pol row defined by a policy."""
+        for row in rows.values():
+            entry = self.lookup(row["Key"], row["Value"])
+            if entry:
+                row["Policy"] = entry[0]
+                row["PolicyFile"] = entry[2]
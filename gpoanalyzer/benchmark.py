@@ -0,0 +1,348 @@
+"""Regression benchmark of the GPOAnalyzer parsing paths."""
+# gpoanalyzer/benchmark.py
+
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import NamedTuple
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from gpoanalyzer.common import json_to_file
+from gpoanalyzer.generate import generate_sysvol
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer
+from gpoanalyzer.memory import MemoryProfiler
+from gpoanalyzer.plugins import PLUGINS
+from gpoanalyzer.snapshot import Snapshot
+from gpoanalyzer.watch import GPOWatcher
+
+console = Console()
+
+# Longest value shown when reporting a difference
+MAX_REPR = 80
+
+
+class EngineResult(NamedTuple):
+    """Outcome of an engine: equality with the expected results, best time and peak memory."""
+    name: str
+    equal: bool
+    difference: str
+    seconds: float
+    peak: int
+
+
+def relative_paths(value, prefix: str):
+    """Return a JSON value with the strings starting with `prefix` made relative to it."""
+    if isinstance(value, dict):
+        return {relative_paths(key, prefix): relative_paths(item, prefix)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [relative_paths(item, prefix) for item in value]
+    if isinstance(value, str) and value.startswith(prefix):
+        return value[len(prefix):].replace(os.sep, "/")
+    return value
+
+
+def canonical(results, gpo_path: str):
+    """
+    Return results as plain JSON data that does not depend on where they were parsed.
+
+    Args:
+        results (dict): The results of an engine.
+        gpo_path (str): The GPO directory the results were parsed from.
+
+    Returns:
+        dict: The results with the key types of a snapshot, and file paths
+              relative to the GPO directory with "/" separators.
+    """
+    return relative_paths(json.loads(json.dumps(results)), os.path.join(gpo_path, ""))
+
+
+def short_repr(value) -> str:
+    """Return the repr of a value, truncated to `MAX_REPR` characters."""
+    text = repr(value)
+    return text if len(text) <= MAX_REPR else text[:MAX_REPR - 3] + "..."
+
+
+def dict_difference(expected: dict, actual: dict, path: str) -> str:
+    """Return the first difference between two JSON objects, or None."""
+    for key in sorted(set(expected) | set(actual)):
+        key_path = f"{path}[{key!r}]"
+        if key not in actual:
+            return f"{key_path} is missing"
+        if key not in expected:
+            return f"{key_path} is unexpected"
+        difference = first_difference(expected[key], actual[key], key_path)
+        if difference:
+            return difference
+    return None
+
+
+def list_difference(expected: list, actual: list, path: str) -> str:
+    """Return the first difference between two JSON arrays, or None."""
+    if len(expected) != len(actual):
+        return f"{path} has {len(actual)} items instead of {len(expected)}"
+    for position, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+        difference = first_difference(expected_item, actual_item, f"{path}[{position}]")
+        if difference:
+            return difference
+    return None
+
+
+def first_difference(expected, actual, path: str = "results") -> str:
+    """
+    Find the first difference between two JSON values.
+
+    Args:
+        expected: The reference value.
+        actual: The value compared to the reference.
+        path (str): The path of the values, used in the description.
+
+    Returns:
+        str: A description of the first difference, or None if the values are equal.
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return dict_difference(expected, actual, path)
+    if isinstance(expected, list) and isinstance(actual, list):
+        return list_difference(expected, actual, path)
+    if expected != actual:
+        return f"{path} is {short_repr(actual)} instead of {short_repr(expected)}"
+    return None
+
+
+class Engines:
+    """The parsing paths compared with `GPOAnalyzer.parse`.
+
+    Each engine parses the same categories of the same GPO directory and must
+    return the same results as the reference: the standard library XML
+    backend, parsing all categories at once. As the engines share the file
+    decoders, a regression in those is caught by comparing with golden results
+    stored by an earlier version instead.
+    """
+
+    def __init__(self, gpo_path: str, user_args: list, workdir: str) -> None:
+        """Initialize the Engines instance.
+
+        Args:
+            gpo_path (str): The path to the GPO files.
+            user_args (list): The categories to parse.
+            workdir (str): A folder for the files engines need, such as snapshots.
+        """
+        self.gpo_path = gpo_path
+        self.user_args = user_args
+        self.snapshot_path = os.path.join(workdir, "benchmark.snapshot")
+
+    def available(self) -> dict:
+        """Return the engines that can run here by name, the reference first."""
+        engines = {
+            "reference": self.reference,
+            "lxml": self.lxml,
+            "lazy": self.lazy,
+            "per-category": self.per_category,
+            "per-file": self.per_file,
+            "snapshot": self.snapshot,
+        }
+        if importlib.util.find_spec("lxml") is None:
+            del engines["lxml"]
+        return engines
+
+    def prepare(self):
+        """Create the files the engines read, outside of the measurements."""
+        Snapshot.capture(GPOAnalyzer(self.gpo_path), self.user_args).save(self.snapshot_path)
+
+    def reference(self) -> dict:
+        """Parse all categories at once with the standard library XML backend."""
+        return GPOAnalyzer(self.gpo_path, xml_backend="stdlib").parse(self.user_args)
+
+    def lxml(self) -> dict:
+        """Parse all categories at once with the lxml backend."""
+        return GPOAnalyzer(self.gpo_path, xml_backend="lxml").parse(self.user_args)
+
+    def lazy(self) -> dict:
+        """Read every category of the lazy results of `parse_lazy`."""
+        return GPOAnalyzer(self.gpo_path).parse_lazy(self.user_args).to_dict()
+
+    def per_category(self) -> dict:
+        """Parse each category on its own, as when only some are selected."""
+        results = {}
+        for arg in self.user_args:
+            results.update(GPOAnalyzer(self.gpo_path).parse([arg]))
+        return results
+
+    def per_file(self) -> dict:
+        """Parse file by file and merge the results, as the watch mode does."""
+        watcher = GPOWatcher(GPOAnalyzer(self.gpo_path), self.user_args)
+        watcher.poll()
+        return watcher.results
+
+    def snapshot(self) -> dict:
+        """Load the results from a snapshot saved by `prepare`."""
+        return Snapshot.load(self.snapshot_path).results
+
+
+def measure(run, repeat: int):
+    """
+    Time an engine and measure its peak memory.
+
+    Args:
+        run (callable): The engine.
+        repeat (int): The number of timed runs, the best one is kept.
+
+    Returns:
+        tuple: The results of the last run, the best time in seconds and the
+               peak traced memory of an extra run, in bytes.
+    """
+    best = None
+    results = None
+    for _ in range(repeat):
+        results = None
+        gc.collect()
+        started = time.perf_counter()
+        results = run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Memory is traced in a separate run, as tracing slows parsing down
+    gc.collect()
+    profiler = MemoryProfiler(top=0)
+    profiler.start()
+    try:
+        with profiler.phase("run"):
+            run()
+    finally:
+        profiler.stop()
+
+    return results, best, profiler.peak
+
+
+def run_benchmark(engines: Engines, names: list, repeat: int, expected: dict = None) -> list:
+    """
+    Run the engines and compare their results with the expected ones.
+
+    Args:
+        engines (Engines): The engines.
+        names (list): The names of the engines to run, the reference first.
+        repeat (int): The number of timed runs of each engine.
+        expected (dict): Stored canonical results every engine is compared with,
+                         the reference included. Defaults to the results of the
+                         reference.
+
+    Returns:
+        list: One `EngineResult` per engine.
+    """
+    available = engines.available()
+    engines.prepare()
+    outcomes = []
+
+    for name in names:
+        results, seconds, peak = measure(available[name], repeat)
+        results = canonical(results, engines.gpo_path)
+        if expected is None:
+            expected = results
+        difference = first_difference(expected, results)
+        outcomes.append(EngineResult(name, difference is None, difference, seconds, peak))
+        console.print(f"[dim]{escape(name)}: {seconds:.3f}s[/dim]", highlight=False)
+
+    return outcomes
+
+
+def print_outcomes(outcomes: list):
+    """Print the outcomes as a table, relative to the reference."""
+    reference = outcomes[0]
+    table = Table(title="Benchmark")
+    table.add_column("Engine")
+    table.add_column("Results")
+    table.add_column("Time", justify="right")
+    table.add_column("Speed", justify="right")
+    table.add_column("Peak Memory", justify="right")
+    table.add_column("Memory", justify="right")
+
+    for outcome in outcomes:
+        table.add_row(
+            escape(outcome.name),
+            "[green]equal[/green]" if outcome.equal else "[red]different[/red]",
+            f"{outcome.seconds:.3f}s",
+            f"{reference.seconds / outcome.seconds:.2f}x" if outcome.seconds else "-",
+            f"{outcome.peak / 2 ** 20:.2f} MB",
+            f"{outcome.peak / reference.peak:.2f}x" if reference.peak else "-")
+
+    console.print(table)
+
+    for outcome in outcomes:
+        if not outcome.equal:
+            console.print(f"[red]{escape(outcome.name)}: {escape(outcome.difference)}[/red]")
+
+
+def main():
+    """Command line entry point of the benchmark."""
+    engine_names = list(Engines("", [], "").available())
+    parser = argparse.ArgumentParser(
+        prog="python -m gpoanalyzer.benchmark",
+        description="Check that every parsing path returns the results of GPOAnalyzer.parse, "
+                    "or stored golden results, and compare their speed and memory.")
+    parser.add_argument("gpopath", nargs="?",
+                        help="GPO directory to benchmark, a generated SYSVOL if omitted")
+    parser.add_argument("--gpos", type=int, default=100,
+                        help="Number of GPOs of the generated SYSVOL (default: 100)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed runs of each engine, the best is kept (default: 3)")
+    parser.add_argument("--category", action="append", choices=PLUGINS.names(),
+                        help="Category to parse (can be repeated, default: all)")
+    parser.add_argument("--engine", action="append", choices=engine_names[1:],
+                        help="Engine compared with the reference (can be repeated, default: all)")
+    parser.add_argument("--output", "-o", type=str,
+                        help="Also write the outcomes to a JSON file")
+    parser.add_argument("--golden", type=str,
+                        help="Compare every engine, the reference included, with the "
+                             "results stored in this JSON file")
+    parser.add_argument("--save-golden", type=str,
+                        help="Write the results of the reference to a JSON file, "
+                             "for later runs with --golden")
+    args = parser.parse_args()
+
+    if args.repeat < 1 or args.gpos < 1:
+        parser.error("--repeat and --gpos must be positive integers")
+    if args.gpopath and not os.path.isdir(args.gpopath):
+        parser.error(f"the GPO file path '{args.gpopath}' does not exist")
+
+    expected = None
+    if args.golden:
+        try:
+            with open(args.golden, "r", encoding="utf-8") as file:
+                expected = json.load(file)
+        except (OSError, ValueError) as error:
+            parser.error(f"cannot read the golden results '{args.golden}': {error}")
+
+    with tempfile.TemporaryDirectory(prefix="gpoanalyzer-benchmark-") as workdir:
+        gpo_path = args.gpopath
+        if not gpo_path:
+            gpo_path = os.path.join(workdir, "sysvol")
+            total = generate_sysvol(gpo_path, gpos=args.gpos)
+            console.print(f"Generated {args.gpos} GPOs ({total / 2 ** 20:.2f} MB)")
+
+        engines = Engines(gpo_path, args.category or PLUGINS.names(), workdir)
+        names = ["reference"] + (args.engine or engine_names[1:])
+        outcomes = run_benchmark(engines, list(dict.fromkeys(names)), args.repeat, expected)
+        if args.save_golden:
+            golden = canonical(engines.reference(), gpo_path)
+            if json_to_file(args.save_golden, golden):
+                console.print(f"[green]File created successfully at: '{args.save_golden}'[/green]")
+
+    print_outcomes(outcomes)
+    if args.output:
+        if json_to_file(args.output, [outcome._asdict() for outcome in outcomes]):
+            console.print(f"[green]File created successfully at: '{args.output}'[/green]")
+
+    if not all(outcome.equal for outcome in outcomes):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
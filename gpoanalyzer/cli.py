@@ -2,16 +2,49 @@
 # gpoanalyzer/cli.py
 
 import argparse
+import importlib.util
 import json
 import os
+import re
 import sys
+from contextlib import redirect_stdout
 from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
 
-from gpoanalyzer.gpo_value_paths import gpo_value_paths
-from gpoanalyzer.gpoanalyzer import FILENAMES, GPOAnalyzer
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer
+from gpoanalyzer.graph import GRAPH_FORMATS, GraphWriter, export_graph
+from gpoanalyzer.memory import MemoryProfiler
+from gpoanalyzer.admx import PolicyIndex
+from gpoanalyzer.findings import FindingsEngine
+from gpoanalyzer.progress import ParseProgress
+from gpoanalyzer.parse.limits import ParseLimits
+from gpoanalyzer.parse import XML_BACKENDS
+from gpoanalyzer.plugins import PLUGINS
 from gpoanalyzer.common import json_to_file, print_dict_as_tree
+from gpoanalyzer.search import load_patterns
+from gpoanalyzer.server import GPOQueryServer
+from gpoanalyzer.snapshot import Snapshot, SnapshotError
+from gpoanalyzer.watch import GPOWatcher
 
 console = Console()
+error_console = Console(stderr=True)
+
+# Options selecting a mode, by destination, only one mode runs at a time
+MODE_OPTIONS = {
+    'save_snapshot': '--save-snapshot',
+    'list_gpos': '--list-gpos',
+    'graph': '--graph',
+    'profile_memory': '--profile-memory',
+    'watch': '--watch',
+    'serve': '--serve',
+    'findings': '--findings',
+    'find': '--find',
+    'find_file': '--find-file',
+}
+
+# Modes with an output format of their own
+NON_JSON_MODES = ('save_snapshot', 'graph', 'watch', 'serve')
 
 
 def parse_cmdline() -> argparse.ArgumentParser:
@@ -22,7 +55,8 @@ def parse_cmdline() -> argparse.ArgumentParser:
     # General arguments group
     general_args = parser.add_argument_group('General Options')
     general_args.add_argument(
-        'gpopath', type=str, help='Path to the GPO data directory')
+        'gpopath', type=str, nargs='?',
+        help='Path to the GPO data directory, optional with --load-snapshot')
 
     # Add mutually exclusive group for scan and json options
     exclusive_group = general_args.add_mutually_exclusive_group()
@@ -32,105 +66,512 @@ def parse_cmdline() -> argparse.ArgumentParser:
     exclusive_group.add_argument("--find", '-f',
                                  type=str,
                                  help='Search for a specific string or pattern')
+    exclusive_group.add_argument("--find-file", '-F',
+                                 type=str,
+                                 metavar='PATTERNS',
+                                 help='Search for all literal and "re:" regex terms in a file')
     general_args.add_argument(
         '--output', '-o', type=str, help='Output results to a specified file path')
+    general_args.add_argument(
+        '--no-progress', action='store_true',
+        help='Do not show progress on standard error (hidden when it is not a terminal)')
 
-    # Add file options
-    files_args = parser.add_argument_group('Supported Files')
-    files_args.add_argument('--shortcuts', action='store_true',
-                            help='Extract shortcut configurations from Shortcuts XML files')
-    files_args.add_argument('--scheduledtasks', action='store_true',
-                            help='Extract scheduled tasks from ScheduledTasks XML files')
-    files_args.add_argument('--drives', action='store_true',
-                            help='Extract network drive mappings from Drives XML files')
-    files_args.add_argument('--groups', action='store_true',
-                            help='Extract group membership settings from Groups XML files')
-    files_args.add_argument('--printers', action='store_true',
-                            help='Extract printer configurations from Printers.xml')
-    files_args.add_argument('--registryxml', action='store_true',
-                            help='Extract settings from Registry.xml')
-    files_args.add_argument('--envvars', action='store_true',
-                            help='Extract env variable settings from EnvironmentVariables.xml')
-    files_args.add_argument('--files', action='store_true',
-                            help='Extract file policies from Files.xml')
-    files_args.add_argument('--services', action='store_true',
-                            help='Extract service configurations from Services.xml')
-    files_args.add_argument('--folders', action='store_true',
-                            help='Extract folder settings from Folders.xml')
-    files_args.add_argument('--internetsettings', action='store_true',
-                            help='Extract internet settings from InternetSettings XML files')
-    files_args.add_argument('--registrypol', action='store_true',
-                            help='Extract registry settings from Registry.pol')
-    files_args.add_argument('--gpttmpl', action='store_true',
-                            help='Extract group policy template data from GptTmpl.inf files')
+    # Add search options
+    search_args = parser.add_argument_group('Search Options')
+    search_args.add_argument('--max-results', type=int, metavar='N',
+                             help='Stop searching after N matches')
+    search_args.add_argument('--first', action='store_true',
+                             help='Stop searching after the first match')
 
-    if len(sys.argv) == 2:
-        parser.print_help()
-        sys.exit(1)
+    # Add mode options
+    mode_args = parser.add_argument_group('Modes')
+    mode_args.add_argument('--findings', action='store_true',
+                           help='Report security findings from the built-in rules')
+    mode_args.add_argument('--graph', choices=GRAPH_FORMATS,
+                           help='Stream GPO, group membership and task principal edges')
+    mode_args.add_argument('--profile-memory', action='store_true',
+                           help='Report peak memory and top allocation sites of each phase')
+    mode_args.add_argument('--memory-budget', type=float, metavar='MB',
+                           help='Exit with an error if the profiled peak memory exceeds MB')
+    mode_args.add_argument('--watch', action='store_true',
+                           help='Keep results in memory and print changes as NDJSON events')
+    mode_args.add_argument('--interval', type=float, default=5.0, metavar='SECONDS',
+                           help='Polling interval of the watch mode (default: 5)')
+    mode_args.add_argument('--serve', action='store_true',
+                           help='Parse once and answer queries over a local HTTP/JSON API')
+    mode_args.add_argument('--host', type=str, default='127.0.0.1',
+                           help='Address of the query server (default: 127.0.0.1)')
+    mode_args.add_argument('--port', type=int, default=8765,
+                           help='Port of the query server (default: 8765)')
+
+    # Add GPO selection options
+    gpo_args = parser.add_argument_group('GPO Selection')
+    gpo_args.add_argument('--gpo', action='append', metavar='GUID|NAME',
+                          help='Only discover and parse the given GPO (can be repeated)')
+    gpo_args.add_argument('--list-gpos', action='store_true',
+                          help='List the GPOs with their display names, versions and files')
+
+    # Add snapshot options
+    snapshot_args = parser.add_argument_group('Snapshots')
+    snapshot_args.add_argument('--save-snapshot', type=str, metavar='FILE',
+                               help='Save the results of the selected files (all files if '
+                                    'none) to a compressed snapshot')
+    snapshot_args.add_argument('--load-snapshot', type=str, metavar='FILE',
+                               help='Read the results from a snapshot instead of the GPO directory')
+
+    # Add policy definitions options
+    admx_args = parser.add_argument_group('Policy Definitions')
+    admx_args.add_argument('--admx', type=str, metavar='PATH',
+                           help='Annotate Registry.pol rows using a PolicyDefinitions folder')
+    admx_args.add_argument('--admx-lang', type=str, default='en-US', metavar='LANG',
+                           help='Language of the ADML files (default: en-US)')
+
+    # Add parser options
+    parser_args = parser.add_argument_group('Parser Options')
+    parser_args.add_argument('--xml-backend', choices=XML_BACKENDS, default='auto',
+                             help='XML backend, the standard library with auto (default: auto)')
+
+    # Add limit options
+    limit_args = parser.add_argument_group('Limits')
+    limit_args.add_argument('--max-file-size', type=int, metavar='BYTES',
+                            help='Skip files larger than BYTES')
+    limit_args.add_argument('--max-parse-time', type=float, metavar='SECONDS',
+                            help='Skip files taking longer than SECONDS to parse')
+
+    add_file_arguments(parser)
 
     return parser
 
 
+def add_file_arguments(parser):
+    """Add the arguments selecting the supported files to parse, one per parser plugin."""
+    files_args = parser.add_argument_group('Supported Files')
+    # The flag of a plugin must not collide with the other options
+    PLUGINS.reserve(action.dest for action in parser._actions)  # pylint: disable=protected-access
+    for plugin in PLUGINS:
+        files_args.add_argument(f'--{plugin.name}', dest=plugin.name, action='store_true',
+                                help=plugin.description)
+
+
 def print_as_tree(data):
     """Print data as tree to standard output"""
     for key in data:
         print_dict_as_tree(d={key: data[key]}, root_name="Results")
 
 
-def app():
-    """Main function of the CLI interface."""
+def print_findings(findings):
+    """Print findings as a table to standard output"""
+    colors = {"high": "red", "medium": "yellow", "low": "cyan", "info": "white"}
+    table = Table(title="Findings")
+    table.add_column("Severity")
+    table.add_column("Rule")
+    table.add_column("Value")
+    table.add_column("Source")
 
-    # Parse the command line arguments
-    parser = parse_cmdline()
-    args = parser.parse_args()
+    for finding in findings:
+        color = colors[finding["severity"]]
+        table.add_row(
+            f"[{color}]{finding['severity']}[/{color}]",
+            f"{escape(finding['id'])}\n{escape(finding['title'])}",
+            escape(f"{finding['field']}: {finding['value']}"),
+            escape(str(finding["source"])))
 
-    # Check if the provided GPO file path exists
-    if not os.path.exists(args.gpopath):
+    console.print(table)
+
+
+def print_skipped(skipped):
+    """Print the files skipped by the parsers to standard error"""
+    for entry in skipped:
+        error_console.print(
+            f"[yellow]Skipped file '{escape(entry['path'])}': {escape(entry['reason'])}[/yellow]")
+
+
+def print_matches(matches) -> int:
+    """Print search matches to standard output as they are found.
+
+    Returns:
+        int: The number of printed matches.
+    """
+    count = 0
+    for match in matches:
+        term = f"[bold green]{escape(match.term)}[/bold green] " if match.term else ""
         console.print(
-            f"[red]Error: The GPO file path '{args.gpopath}' does not exist.[/red]")
+            f"{term}[bold blue]{escape(match.format_path())}[/bold blue]: "
+            f"[bold cyan]{escape(match.value)}[/bold cyan]")
+        count += 1
+    return count
+
+
+def print_gpos(gpos):
+    """Print GPOs as a table to standard output"""
+    table = Table(title="GPOs")
+    table.add_column("GUID", no_wrap=True)
+    table.add_column("Name")
+    table.add_column("Version", no_wrap=True)
+    table.add_column("Files")
+
+    for gpo in gpos:
+        files = []
+        for category, category_files in gpo["files"].items():
+            scopes = sorted({file["scope"] for file in category_files if file["scope"]})
+            files.append(f"{category}: {len(category_files)} ({', '.join(scopes) or '-'})")
+        table.add_row(
+            gpo["guid"],
+            escape(gpo["displayName"]),
+            f"U:{gpo['userVersion']} M:{gpo['machineVersion']}",
+            "\n".join(files))
+
+    console.print(table)
+
+
+def run_list_gpos(args, gpoanalyzer):
+    """Index the GPO directory and print the GPOs it contains."""
+    index = gpoanalyzer.build_index()
+    gpos = sorted((gpo.to_dict() for gpo in index.gpos.values()),
+                  key=lambda gpo: (gpo["displayName"].lower(), gpo["guid"]))
+
+    if not gpos:
+        console.print("[red]No GPO found.[/red]")
         return
 
-    # Initialize the GPOAnalyzer with the provided GPO file path
-    gpoanalyzer = GPOAnalyzer(gpo_file_path=args.gpopath)
+    if args.output:
+        if json_to_file(args.output, gpos):
+            console.print(
+                f"[green]File created successfully at: '{args.output}'[/green]")
+    elif args.json:
+        console.print(json.dumps(gpos, indent=2))
+    else:
+        print_gpos(gpos)
 
-    # Collect the file arguments based on the provided command line arguments
-    file_args = [
-        file_key for file_key in gpo_value_paths if getattr(args, file_key)]
 
-    if args.find:
-        # If the find argument is provided, parse the necessary files
-        if len(file_args) == 0:
-            parsed_data = gpoanalyzer.parse(FILENAMES)
-        else:
-            parsed_data = gpoanalyzer.parse(file_args)
+def run_save_snapshot(args, gpoanalyzer, file_args):
+    """Parse the requested files and save the results to a snapshot."""
+    # Save all supported files unless a subset was requested
+    snapshot = Snapshot.capture(gpoanalyzer, file_args or gpoanalyzer.plugins.names())
+    try:
+        size = snapshot.save(args.save_snapshot)
+    except OSError as e:
+        console.print(
+            f"[red]Error: Unable to write snapshot '{args.save_snapshot}': {e}[/red]")
+        return
+    console.print(
+        f"[green]Snapshot of {len(snapshot.index.files)} files saved to "
+        f"'{args.save_snapshot}' ({size} bytes)[/green]")
+
+
+def run_graph(args, gpoanalyzer):
+    """Stream the group and task graph to standard output or a file."""
+    if not args.output:
+        try:
+            export_graph(gpoanalyzer, GraphWriter(sys.stdout, args.graph))
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # The reader stopped early, e.g. `| head`: silence the final flush
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+
+    try:
+        with open(args.output, "w", encoding="utf-8", newline="") as file:
+            edges = export_graph(gpoanalyzer, GraphWriter(file, args.graph))
+    except OSError as e:
+        console.print(f"[red]Error: Unable to write graph '{args.output}': {e}[/red]")
+        return
+    console.print(
+        f"[green]{edges} edges written to '{args.output}'[/green]")
 
-        # Search the parsed data for the search term
-        find_result = gpoanalyzer.find(data=parsed_data, search_term=args.find)
 
-        # Print the search results as a tree structure
-        if find_result:
-            print_as_tree(find_result)
-        else:
+def print_memory_profile(profiler):
+    """Print the peak memory and top allocation sites of each phase"""
+    table = Table(title="Memory Profile")
+    table.add_column("Phase")
+    table.add_column("Peak", justify="right")
+    table.add_column("Retained", justify="right")
+    table.add_column("Top Allocation Sites")
+
+    for phase in profiler.phases:
+        sites = [f"{site.size / 2 ** 20:8.2f} MB  "
+                 f"{escape(os.sep.join(site.filename.split(os.sep)[-2:]))}:{site.lineno}"
+                 for site in phase.sites]
+        table.add_row(escape(phase.name), f"{phase.peak / 2 ** 20:.2f} MB",
+                      f"{phase.retained / 2 ** 20:.2f} MB", "\n".join(sites))
+
+    console.print(table)
+
+
+def run_profile_memory(args, gpoanalyzer, file_args):
+    """Run discovery, parsing and rendering phase by phase under tracemalloc."""
+    # Profile all supported files unless a subset was requested
+    file_args = file_args or gpoanalyzer.plugins.names()
+    profiler = MemoryProfiler()
+    results = {}
+
+    profiler.start()
+    try:
+        with profiler.phase("discover"):
+            index = gpoanalyzer.build_index()
+            file_paths = {arg: gpoanalyzer.discover(arg, index) for arg in file_args}
+
+        for arg in file_args:
+            with profiler.phase(f"parse {arg}"):
+                arg_results = gpoanalyzer.parse_arg(arg, file_paths[arg])
+            if arg_results is not None:
+                results[arg] = arg_results
+
+        # Render the output the run would print, then discard it
+        with profiler.phase("render json" if args.json else "render tree"):
+            with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+                if args.json:
+                    devnull.write(json.dumps(results, indent=2))
+                else:
+                    print_as_tree(results)
+    finally:
+        profiler.stop()
+
+    if args.output:
+        if json_to_file(args.output, profiler.to_dict()):
             console.print(
-                "[yellow]No results found for the given search term.[/yellow]")
+                f"[green]File created successfully at: '{args.output}'[/green]")
     else:
-        # Parse the necessary files
-        parsed_data = gpoanalyzer.parse(file_args)
+        print_memory_profile(profiler)
 
-        # Check if parsed_data is empty and print a message if so
-        if not parsed_data:
-            console.print("[red]No data found.[/red]")
-            return
+    if args.memory_budget is not None and profiler.peak > args.memory_budget * 2 ** 20:
+        error_console.print(
+            f"[red]Error: Peak memory of {profiler.peak / 2 ** 20:.2f} MB exceeds "
+            f"the budget of {args.memory_budget} MB[/red]")
+        sys.exit(1)
+
+
+def run_watch(args, gpoanalyzer, file_args):
+    """Watch the GPO directory and print changes as NDJSON events."""
+    # Watch all supported files unless a subset was requested
+    watcher = GPOWatcher(gpoanalyzer, file_args or gpoanalyzer.plugins.names(),
+                         interval=args.interval)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+def run_serve(args, gpoanalyzer, file_args):
+    """Serve the parsed GPO data over a local HTTP/JSON API."""
+    # Load all supported files unless a subset was requested
+    query_server = GPOQueryServer(gpoanalyzer, file_args or gpoanalyzer.plugins.names())
+    console.print(
+        f"[green]Serving GPO data on http://{args.host}:{args.port}[/green]")
+    try:
+        query_server.serve_forever(host=args.host, port=args.port)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_findings(args, gpoanalyzer, file_args):
+    """Evaluate the findings rules and print the findings."""
+    # Evaluate the rules while parsing, on the data of each file
+    gpoanalyzer.findings = FindingsEngine()
+    gpoanalyzer.parse(file_args or gpoanalyzer.plugins.names())
+    findings = gpoanalyzer.findings.sorted_findings()
 
-        # If output argument is provided, save the parsed data to a file
-        if args.output:
-            if json_to_file(args.output, parsed_data):
-                console.print(
-                    f"[green]File created successfully at: '{args.output}'[/green]")
+    if not findings:
+        console.print("[yellow]No findings.[/yellow]")
+        return
+
+    if args.output:
+        if json_to_file(args.output, findings):
+            console.print(
+                f"[green]File created successfully at: '{args.output}'[/green]")
+    elif args.json:
+        console.print(json.dumps(findings, indent=2))
+    else:
+        print_findings(findings)
+
+
+def run_find(args, gpoanalyzer, file_args):
+    """Search the parsed data and print the matches."""
+    # Load the search terms before parsing so a bad patterns file fails fast
+    matcher = None
+    if args.find_file:
+        try:
+            matcher = load_patterns(args.find_file)
+        except (OSError, re.error) as e:
+            console.print(
+                f"[red]Error: Unable to load patterns file '{args.find_file}': {e}[/red]")
             return
 
-        # Print the parsed data in JSON format or as a tree structure
-        if args.json:
-            console.print(json.dumps(parsed_data, indent=2))
-        else:
-            print_as_tree(parsed_data)
+    # If the find argument is provided, parse the necessary files lazily,
+    # so that an early stop skips the categories that are never reached
+    if len(file_args) == 0:
+        parsed_data = gpoanalyzer.parse_lazy(gpoanalyzer.plugins.names())
+    else:
+        parsed_data = gpoanalyzer.parse_lazy(file_args)
+
+    # Stop after the first match when requested
+    max_results = 1 if args.first else args.max_results
+
+    if matcher:
+        # Search the parsed data for all terms in a single pass
+        find_result = gpoanalyzer.find_many(
+            data=parsed_data, matcher=matcher, max_results=max_results)
+    else:
+        # Search the parsed data for the search term
+        find_result = gpoanalyzer.find(
+            data=parsed_data, search_term=args.find, max_results=max_results)
+
+    # Print the search results as they are found
+    if not print_matches(find_result):
+        console.print(
+            "[yellow]No results found for the given search term.[/yellow]")
+
+
+def run_report(args, gpoanalyzer, file_args):
+    """Parse the requested files and print or save the results."""
+    # Parse the necessary files, one category at a time as they are printed
+    parsed_data = gpoanalyzer.parse_lazy(file_args)
+
+    # Check if parsed_data is empty and print a message if so
+    if not parsed_data:
+        console.print("[red]No data found.[/red]")
+        return
+
+    # If output argument is provided, save the parsed data to a file
+    if args.output:
+        if json_to_file(args.output, parsed_data.to_dict()):
+            console.print(
+                f"[green]File created successfully at: '{args.output}'[/green]")
+        return
+
+    # Print the parsed data in JSON format or as a tree structure
+    if args.json:
+        console.print(json.dumps(parsed_data.to_dict(), indent=2))
+    else:
+        print_as_tree(parsed_data)
+
+
+def validate_args(parser, args):
+    """Exit with a usage error if option values are invalid."""
+    # A single argument is only a path or a flag, nothing to do: show the help
+    if len(sys.argv) == 2:
+        parser.print_help()
+        sys.exit(1)
+
+    if args.max_results is not None and args.max_results < 1:
+        parser.error("--max-results must be a positive integer")
+    if (args.first or args.max_results is not None) and not (args.find or args.find_file):
+        parser.error("--first and --max-results require --find or --find-file")
+    if args.max_file_size is not None and args.max_file_size < 1:
+        parser.error("--max-file-size must be a positive integer")
+    if args.max_parse_time is not None and args.max_parse_time <= 0:
+        parser.error("--max-parse-time must be a positive number")
+    if args.memory_budget is not None and args.memory_budget <= 0:
+        parser.error("--memory-budget must be a positive number")
+
+    modes = [mode for mode in MODE_OPTIONS if getattr(args, mode)]
+    if len(modes) > 1:
+        parser.error(f"{MODE_OPTIONS[modes[0]]} cannot be used with {MODE_OPTIONS[modes[1]]}")
+    if args.json and modes and modes[0] in NON_JSON_MODES:
+        parser.error(f"{MODE_OPTIONS[modes[0]]} cannot be used with --json")
+
+    if args.xml_backend == 'lxml' and importlib.util.find_spec('lxml') is None:
+        parser.error("--xml-backend lxml requires the lxml package")
+
+    if args.load_snapshot:
+        # Watching and findings need the files, the selection is made when saving
+        if args.watch or args.findings or args.gpo:
+            parser.error("--load-snapshot cannot be used with --watch, --findings or --gpo")
+    elif not args.gpopath:
+        parser.error("the following arguments are required: gpopath")
+
+
+def create_analyzer(args):
+    """Create the GPOAnalyzer configured by the command line arguments.
+
+    Returns:
+        GPOAnalyzer: The analyzer, or None if an input could not be loaded.
+    """
+    # Load the snapshot the results are read from, if any
+    snapshot = None
+    if args.load_snapshot:
+        try:
+            snapshot = Snapshot.load(args.load_snapshot)
+        except (OSError, SnapshotError) as e:
+            console.print(
+                f"[red]Error: Unable to load snapshot '{args.load_snapshot}': {e}[/red]")
+            return None
+
+    # Check if the provided GPO file path exists
+    elif not os.path.exists(args.gpopath):
+        console.print(
+            f"[red]Error: The GPO file path '{args.gpopath}' does not exist.[/red]")
+        return None
+
+    # Load the policy definitions index, built once and cached on disk
+    policy_index = None
+    if args.admx:
+        if not os.path.isdir(args.admx):
+            console.print(
+                f"[red]Error: The PolicyDefinitions path '{args.admx}' does not exist.[/red]")
+            return None
+        policy_index = PolicyIndex(args.admx, language=args.admx_lang)
+
+    # Initialize the GPOAnalyzer with the provided GPO file path
+    limits = ParseLimits(max_bytes=args.max_file_size, max_seconds=args.max_parse_time)
+    gpoanalyzer = GPOAnalyzer(
+        gpo_file_path=snapshot.index.gpo_path if snapshot else args.gpopath,
+        limits=limits, policy_index=policy_index, xml_backend=args.xml_backend)
+    gpoanalyzer.snapshot = snapshot
+
+    # Restrict discovery and parsing to the selected GPOs
+    gpoanalyzer.gpo_selection = args.gpo
+
+    # Show progress while parsing, only when standard error is a terminal
+    gpoanalyzer.progress = (
+        ParseProgress() if not (args.no_progress or snapshot) and ParseProgress.enabled()
+        else None)
+
+    return gpoanalyzer
+
+
+def app():
+    """Main function of the CLI interface."""
+
+    # Parse the command line arguments
+    parser = parse_cmdline()
+    args = parser.parse_args()
+    validate_args(parser, args)
+
+    for name, reason in PLUGINS.errors:
+        error_console.print(
+            f"[yellow]Warning: Unable to load parser plugin '{escape(name)}': "
+            f"{escape(reason)}[/yellow]")
+
+    gpoanalyzer = create_analyzer(args)
+    if gpoanalyzer is None:
+        return
+    snapshot = gpoanalyzer.snapshot
+
+    # Collect the file arguments based on the provided command line arguments
+    file_args = [plugin.name for plugin in PLUGINS if getattr(args, plugin.name)]
+
+    # Output everything a snapshot holds unless a subset was requested
+    if snapshot and not file_args:
+        file_args = list(snapshot.results)
+
+    if args.save_snapshot:
+        run_save_snapshot(args, gpoanalyzer, file_args)
+    elif args.list_gpos:
+        run_list_gpos(args, gpoanalyzer)
+    elif args.graph:
+        run_graph(args, gpoanalyzer)
+    elif args.profile_memory:
+        run_profile_memory(args, gpoanalyzer, file_args)
+    elif args.watch:
+        run_watch(args, gpoanalyzer, file_args)
+    elif args.serve:
+        run_serve(args, gpoanalyzer, file_args)
+    elif args.findings:
+        run_findings(args, gpoanalyzer, file_args)
+    elif args.find or args.find_file:
+        run_find(args, gpoanalyzer, file_args)
+    else:
+        run_report(args, gpoanalyzer, file_args)
+
+    print_skipped(gpoanalyzer.skipped)
@@ -2,43 +2,10 @@
 # gpoanalyzer/common.py
 
 import json
-import os
 from rich.tree import Tree
 from rich.console import Console
 
 
-def list_files(gpo_path: str, target_filename: str):
-    """List files in the given path that match the target filename.
-
-    Args:
-        gpo_path (str): The path to search for files.
-        target_filename (str): The filename to search for.
-    """
-    files_info = []
-
-    try:
-        for root, _, files in os.walk(gpo_path):
-            for file in files:
-                try:
-                    if file.lower() == target_filename.lower():
-                        full_path = os.path.join(root, file)
-                        size = os.path.getsize(full_path)
-                        files_info.append((full_path, size, file))
-                except OSError:
-                    continue
-    except OSError as e:
-        print("An error occurred while listing files:", e)
-
-    if not files_info:
-        return None
-
-    # Sort by size in descending order
-    files_info.sort(key=lambda x: x[1], reverse=True)
-
-    result_data = [x[0] for x in files_info]
-    return result_data
-
-
 def json_to_file(filepath, data):
     """Write data to a json file at the specified filepath."""
     try:
@@ -0,0 +1,136 @@
+"""Findings engine for GPOAnalyzer."""
+# gpoanalyzer/findings.py
+
+import re
+
+from gpoanalyzer.common import navigate_path
+from gpoanalyzer.gpo_rules import gpo_rules
+from gpoanalyzer.plugins import PLUGINS, ParserRegistry
+
+SEVERITIES = ("high", "medium", "low", "info")
+
+
+def compile_condition(condition: dict):
+    """
+    Compile a rule condition into a predicate on a single value.
+
+    Args:
+        condition (dict): A single-key dictionary naming the condition and
+                          its expected value, e.g. `{"equals": "1"}`.
+
+    Returns:
+        callable: A function returning True if the value satisfies the condition.
+    """
+    if len(condition) != 1:
+        raise ValueError(f"Invalid rule condition: {condition}")
+
+    (name, expected), = condition.items()
+
+    if name == "present":
+        return lambda value: bool(value) == expected
+    if name == "equals":
+        expected = str(expected).lower()
+        return lambda value: value is not None and str(value).lower() == expected
+    if name == "regex":
+        pattern = re.compile(expected, re.IGNORECASE)
+        return lambda value: isinstance(value, str) and bool(pattern.search(value))
+    if name in ("lt", "gt"):
+        def compare(value):
+            try:
+                number = int(value)
+            except (TypeError, ValueError):
+                return False
+            return number < expected if name == "lt" else number > expected
+        return compare
+
+    raise ValueError(f"Invalid rule condition: {name}")
+
+
+def make_predicate(checks: list):
+    """Combine (field path, condition) checks into a predicate on a whole entry."""
+    def predicate(entry):
+        return all(check(navigate_path(entry, path)) for path, check in checks)
+    return predicate
+
+
+def compile_rules(rules: dict, plugins: ParserRegistry = PLUGINS) -> dict:
+    """
+    Compile the declarative rules into per-category predicates.
+
+    Args:
+        rules (dict): The rules, organized by category as in `gpo_rules`.
+        plugins (ParserRegistry): The registry the categories are read from.
+
+    Returns:
+        dict: A dictionary mapping each category to a list of
+              (rule, reported field path, predicate) tuples.
+    """
+    compiled = {}
+
+    for category, category_rules in rules.items():
+        plugin = plugins.get(category)
+        if plugin is None:
+            raise ValueError(f"Invalid rule category: {category}")
+
+        for rule in category_rules:
+            if rule.get("severity") not in SEVERITIES:
+                raise ValueError(f"Invalid severity for rule {rule.get('id')}")
+
+            # Fields must be extracted for the category when its plugin lists them
+            checks = []
+            for field, condition in rule["match"].items():
+                if plugin.fields is not None and field.split('.')[0] not in plugin.fields:
+                    raise ValueError(
+                        f"Field '{field}' of rule {rule['id']} is not extracted for {category}")
+                checks.append((field.split('.'), compile_condition(condition)))
+
+            compiled.setdefault(category, []).append(
+                (rule, checks[0][0], make_predicate(checks)))
+
+    return compiled
+
+
+class FindingsEngine:
+    """Evaluate compiled rules against extracted GPO data."""
+
+    def __init__(self, rules: dict = None, plugins: ParserRegistry = PLUGINS) -> None:
+        """Initialize the FindingsEngine instance.
+
+        Args:
+            rules (dict): The rules to evaluate, `gpo_rules` by default.
+            plugins (ParserRegistry): The plugins of the rule categories.
+        """
+        self.plugins = plugins
+        self.rules = compile_rules(gpo_rules if rules is None else rules, plugins)
+        self.findings = []
+
+    def evaluate(self, category: str, data, source: str = None):
+        """
+        Evaluate the rules of a category against the data of a single file.
+
+        Args:
+            category (str): The category of the data.
+            data: The data returned by `GPOAnalyzer.parse_file`.
+            source (str): The path of the file the data was read from.
+        """
+        category_rules = self.rules.get(category)
+        if not category_rules or not data:
+            return
+
+        plugin = self.plugins.get(category)
+        for entry_source, entry in plugin.iter_entries(data, source):
+            for rule, field_path, predicate in category_rules:
+                if predicate(entry):
+                    self.findings.append({
+                        "id": rule["id"],
+                        "title": rule["title"],
+                        "severity": rule["severity"],
+                        "category": category,
+                        "source": entry_source,
+                        "field": '.'.join(field_path),
+                        "value": navigate_path(entry, field_path),
+                    })
+
+    def sorted_findings(self) -> list:
+        """Return the findings sorted by severity."""
+        return sorted(self.findings, key=lambda finding: SEVERITIES.index(finding["severity"]))
@@ -0,0 +1,176 @@
+"""Synthetic SYSVOL generator for GPOAnalyzer."""
+# gpoanalyzer/generate.py
+
+import argparse
+import os
+import random
+import struct
+import uuid
+
+# Seed of the generated GUIDs, so that the same arguments generate the same tree
+SEED = 1
+
+
+def pol_file(entries) -> bytes:
+    """Encode (key, value name, type, data) entries as a Registry.pol file."""
+    def text(value):
+        return value.encode("utf-16le")
+
+    content = [b"PReg\x01\x00\x00\x00"]
+    for key, value_name, reg_type, data in entries:
+        content.append(text("[") + text(key + "\0") + text(";") + text(value_name + "\0")
+                       + text(";") + struct.pack("<I", reg_type) + text(";")
+                       + struct.pack("<I", len(data)) + text(";") + data + text("]"))
+    return b"".join(content)
+
+
+def groups_xml(index: int, members: int) -> str:
+    """Return a Groups.xml file with a privileged group and a local user."""
+    member_elements = "".join(
+        f'<Member name="CORP\\user{j}" action="ADD" sid="S-1-5-21-1-{j}"/>'
+        for j in range(members))
+    cpassword = "j1Uyj3Vx8TY9LtLZil2uAuZkFQA/4latT76ZwgdHdhw" if index % 2 else ""
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<Groups clsid="{3125E937-EB16-4b4c-9934-544FC6D24D26}">'
+        '<Group clsid="{6D4A79E4-529C-4481-ABD0-F5BD7EA93BA7}" '
+        f'name="Administrators (built-in)" changed="2020-01-0{index % 9 + 1} 10:00:00">'
+        '<Properties action="U" groupName="Administrators (built-in)" groupSid="S-1-5-32-544">'
+        f'<Members>{member_elements}</Members></Properties></Group>'
+        f'<User clsid="{{DF5F1855-51E5-4d24-8B1A-D9BDE98BA1D1}}" name="localadmin{index}" '
+        f'changed="2020-01-01 10:00:00"><Properties action="U" userName="localadmin{index}" '
+        f'cpassword="{cpassword}" neverExpires="1"/></User>'
+        '</Groups>')
+
+
+def scheduled_tasks_xml(index: int, tasks: int) -> str:
+    """Return a ScheduledTasks.xml file with the given number of tasks."""
+    principals = ("CORP\\svc", "NT AUTHORITY\\System")
+    task_elements = "".join(
+        f'<TaskV2 clsid="{{D8896631-B747-47a7-84A6-C155337F3BC8}}" name="task{index}-{j}" '
+        'changed="2021-01-01 10:00:00">'
+        f'<Properties action="C" runAs="{principals[j % 2]}" '
+        'logonType="S4U"><Task version="1.2"><Actions Context="Author"><Exec>'
+        f'<Command>C:\\Windows\\tool{j}.exe</Command><Arguments>-x {index}</Arguments>'
+        '</Exec></Actions></Task></Properties></TaskV2>'
+        for j in range(tasks))
+    return ('<?xml version="1.0" encoding="utf-8"?>\n'
+            f'<ScheduledTasks clsid="{{CC63F200-7309-4ba0-B154-A71CD118DBCC}}">'
+            f'{task_elements}</ScheduledTasks>')
+
+
+def drives_xml(index: int) -> str:
+    """Return a Drives.xml file with a drive mapped with credentials."""
+    return ('<?xml version="1.0" encoding="utf-8"?>\n'
+            '<Drives clsid="{8FDDCC1A-0C3C-43cd-A6B4-71A6DF20DA8C}">'
+            '<Drive clsid="{935D1B74-9CB8-4e3c-9914-7DD559B7A417}" name="S:" status="S:" '
+            f'changed="2019-01-01 10:00:00"><Properties action="U" path="\\\\fs{index}\\share" '
+            'userName="svc_backup"/></Drive></Drives>')
+
+
+def gpttmpl_inf(index: int) -> str:
+    """Return a GptTmpl.inf file with password and privilege settings."""
+    return ("[Unicode]\r\nUnicode=yes\r\n[System Access]\r\n"
+            f"MinimumPasswordLength = {index % 15}\r\nClearTextPassword = {index % 2}\r\n"
+            "LockoutBadCount = 0\r\n[Privilege Rights]\r\n"
+            f"SeDebugPrivilege = *S-1-5-32-544,*S-1-5-21-1-{index}\r\n")
+
+
+def registry_entries(index: int, values: int) -> list:
+    """Return Registry.pol entries of the common registry types."""
+    entries = [
+        ("Software\\Policies\\Microsoft\\Windows\\Installer", "AlwaysInstallElevated",
+         4, struct.pack("<I", index % 2)),
+        ("Software\\Policies\\Corp", "BigEndian", 5, struct.pack(">I", index)),
+        ("Software\\Policies\\Corp", "Quota", 11, struct.pack("<Q", 2 ** 40 + index)),
+        ("Software\\Policies\\Corp", "Servers", 7, "a\0b\0\0".encode("utf-16le")),
+    ]
+    for j in range(values):
+        entries.append((f"Software\\Policies\\Corp\\App{j % 16}", f"Url{j}",
+                        1, f"http://intranet{index}-{j}.corp\0".encode("utf-16le")))
+    return entries
+
+
+def write_file(path: str, content, encoding: str = "utf-8"):
+    """Write a file, creating its folder."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if isinstance(content, bytes):
+        with open(path, "wb") as file:
+            file.write(content)
+    else:
+        with open(path, "w", encoding=encoding, newline="") as file:
+            file.write(content)
+
+
+def generate_sysvol(path: str, gpos: int = 100, members: int = 20, tasks: int = 5,
+                    values: int = 50) -> int:
+    """
+    Generate a synthetic SYSVOL Policies folder.
+
+    Every GPO has a GPT.INI, Groups.xml, ScheduledTasks.xml, Drives.xml,
+    Registry.pol and GptTmpl.inf file. The same arguments always generate
+    the same tree.
+
+    Args:
+        path (str): The folder the Policies folder is created in.
+        gpos (int): The number of GPOs.
+        members (int): The number of members of each group.
+        tasks (int): The number of scheduled tasks of each GPO.
+        values (int): The number of extra Registry.pol values of each GPO.
+
+    Returns:
+        int: The total size of the generated files, in bytes.
+    """
+    rng = random.Random(SEED)
+    total = 0
+
+    for index in range(gpos):
+        guid = f"{{{str(uuid.UUID(int=rng.getrandbits(128))).upper()}}}"
+        gpo_path = os.path.join(path, "Policies", guid)
+        machine = os.path.join(gpo_path, "Machine")
+        files = {
+            os.path.join(gpo_path, "GPT.INI"):
+                f"[General]\r\nVersion={index * 65536 + 3}\r\ndisplayName=Policy {index}\r\n",
+            os.path.join(machine, "Preferences", "Groups", "Groups.xml"):
+                groups_xml(index, members),
+            os.path.join(machine, "Preferences", "ScheduledTasks", "ScheduledTasks.xml"):
+                scheduled_tasks_xml(index, tasks),
+            os.path.join(gpo_path, "User", "Preferences", "Drives", "Drives.xml"):
+                drives_xml(index),
+            os.path.join(machine, "Registry.pol"):
+                pol_file(registry_entries(index, values)),
+        }
+        for file_path, content in files.items():
+            write_file(file_path, content)
+            total += os.path.getsize(file_path)
+
+        # Security templates are written in UTF-16 by the Group Policy editor
+        file_path = os.path.join(machine, "Microsoft", "Windows NT", "SecEdit", "GptTmpl.inf")
+        write_file(file_path, gpttmpl_inf(index), encoding="utf-16")
+        total += os.path.getsize(file_path)
+
+    return total
+
+
+def main():
+    """Command line entry point of the generator."""
+    parser = argparse.ArgumentParser(
+        prog="python -m gpoanalyzer.generate",
+        description="Generate a synthetic SYSVOL Policies folder for benchmarks.")
+    parser.add_argument("path", help="Folder the Policies folder is created in")
+    parser.add_argument("--gpos", type=int, default=100, help="Number of GPOs (default: 100)")
+    parser.add_argument("--members", type=int, default=20,
+                        help="Members of each group (default: 20)")
+    parser.add_argument("--tasks", type=int, default=5,
+                        help="Scheduled tasks of each GPO (default: 5)")
+    parser.add_argument("--values", type=int, default=50,
+                        help="Extra Registry.pol values of each GPO (default: 50)")
+    args = parser.parse_args()
+
+    total = generate_sysvol(args.path, gpos=args.gpos, members=args.members,
+                            tasks=args.tasks, values=args.values)
+    print(f"Generated {args.gpos} GPOs ({total} bytes) in '{args.path}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""GPO discovery index for GPOAnalyzer."""
+# gpoanalyzer/gpo_index.py
+
+import os
+import re
+from typing import NamedTuple
+
+GUID_PATTERN = re.compile(r"\{[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\}",
+                          re.IGNORECASE)
+
+# Folders of a GPO holding the settings of each scope
+SCOPES = {"machine": "Machine", "user": "User"}
+
+
+def normalize_guid(guid: str) -> str:
+    """Return a GPO GUID in upper case and between braces."""
+    guid = guid.strip("{}").upper()
+    return f"{{{guid}}}"
+
+
+def read_gpt_ini(file_path: str) -> dict:
+    """
+    Read the [General] section of a GPT.INI file.
+
+    Args:
+        file_path (str): The path of the GPT.INI file.
+
+    Returns:
+        dict: The keys of the section in lower case with their values, or an
+              empty dictionary if the file cannot be read.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            content = file.read()
+    except OSError:
+        return {}
+
+    # GPT.INI is usually ANSI, but some tools write it in UTF-16
+    if content.startswith((b"\xff\xfe", b"\xfe\xff")):
+        text = content.decode("utf-16", errors="replace")
+    else:
+        text = content.decode("utf-8-sig", errors="replace")
+
+    values = {}
+    section = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("[") and line.endswith("]"):
+            section = line[1:-1].strip().lower()
+        elif section == "general" and "=" in line:
+            key, value = line.split("=", 1)
+            values[key.strip().lower()] = value.strip()
+    return values
+
+
+class IndexedFile(NamedTuple):
+    """A supported file found during discovery."""
+    category: str
+    size: int
+    mtime_ns: int
+    guid: str = None
+    scope: str = None
+
+
+class GPOInfo:
+    """A Group Policy Object and the supported files it contains."""
+
+    def __init__(self, guid: str, path: str, gpt_ini: dict) -> None:
+        """Initialize the GPOInfo instance.
+
+        Args:
+            guid (str): The normalized GUID of the GPO.
+            path (str): The folder of the GPO.
+            gpt_ini (dict): The [General] section of its GPT.INI file.
+        """
+        self.guid = guid
+        self.path = path
+        self.display_name = gpt_ini.get("displayname", "")
+        try:
+            self.version = int(gpt_ini.get("version", 0))
+        except ValueError:
+            self.version = 0
+        # category -> file path -> scope
+        self.files = {}
+
+    @property
+    def user_version(self) -> int:
+        """The version of the user settings, the high word of `version`."""
+        return self.version >> 16
+
+    @property
+    def machine_version(self) -> int:
+        """The version of the computer settings, the low word of `version`."""
+        return self.version & 0xFFFF
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Create a GPO from the output of `to_dict`, without its files."""
+        return cls(data["guid"], data["path"],
+                   {"displayname": data["displayName"], "version": data["version"]})
+
+    def matches(self, selection: set) -> bool:
+        """Return True if the GUID or the display name is selected."""
+        return self.guid in selection or self.display_name.lower() in selection
+
+    def to_dict(self) -> dict:
+        """Return the GPO as a JSON serializable dictionary."""
+        return {
+            "guid": self.guid,
+            "displayName": self.display_name,
+            "version": self.version,
+            "userVersion": self.user_version,
+            "machineVersion": self.machine_version,
+            "path": self.path,
+            "files": {category: [{"path": path, "scope": scope} for path, scope in files.items()]
+                      for category, files in self.files.items()},
+        }
+
+
+class GPOIndex:
+    """Index of the GPOs and supported files of a GPO directory.
+
+    The directory is walked once for all categories. Each GPO folder, named
+    after the GUID of the GPO, is identified with its GPT.INI file as soon as
+    the walk reaches it, so GPOs left out by the selection are never walked.
+    """
+
+    def __init__(self, gpo_path: str, filenames: dict, selection=None) -> None:
+        """Initialize an empty GPOIndex instance, filled by `build`.
+
+        Args:
+            gpo_path (str): The path to the GPO files.
+            filenames (dict): A dictionary mapping each category to its filename,
+                              or to a tuple of filenames.
+            selection (list): Optional GUIDs or display names of the GPOs to
+                              index. All files are indexed if empty.
+        """
+        self.gpo_path = gpo_path
+        # lower case filename -> category
+        self.targets = {}
+        for category, names in filenames.items():
+            for filename in (names,) if isinstance(names, str) else names:
+                self.targets[filename.lower()] = category
+        # GUIDs are matched normalized and display names case-insensitively
+        self.selection = set()
+        for item in selection or ():
+            guid = normalize_guid(item)
+            self.selection.add(guid if GUID_PATTERN.fullmatch(guid) else item.lower())
+        # GUID -> GPOInfo
+        self.gpos = {}
+        # file path -> IndexedFile, in walk order
+        self.files = {}
+
+    def build(self):
+        """Walk the GPO directory and index the GPOs and supported files."""
+        # Folder -> GPO, for the folders of the GPOs being walked
+        owners = {}
+
+        for root, dirs, files in os.walk(self.gpo_path):
+            gpo = owners.pop(root, None)
+            folder_name = os.path.basename(os.path.normpath(root))
+            if gpo is None and GUID_PATTERN.fullmatch(folder_name):
+                gpt_ini = next((file for file in files if file.lower() == "gpt.ini"), None)
+                gpo = GPOInfo(normalize_guid(folder_name), root,
+                              read_gpt_ini(os.path.join(root, gpt_ini)) if gpt_ini else {})
+                if self.selection and not gpo.matches(self.selection):
+                    # Prune the folders of GPOs that were not selected
+                    dirs[:] = []
+                    continue
+                self.gpos[gpo.guid] = gpo
+
+            if gpo is None and self.selection:
+                # Only files of selected GPOs are indexed
+                continue
+
+            if gpo is not None:
+                for folder in dirs:
+                    owners[os.path.join(root, folder)] = gpo
+
+            for file in files:
+                category = self.targets.get(file.lower())
+                if category is not None:
+                    self.add(os.path.join(root, file), category, gpo)
+
+    def add(self, file_path: str, category: str, gpo: GPOInfo = None):
+        """Index a supported file, with the GPO and scope it belongs to."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+
+        scope = None
+        if gpo is not None:
+            folder = os.path.relpath(file_path, gpo.path).split(os.sep)[0]
+            scope = SCOPES.get(folder.lower())
+            gpo.files.setdefault(category, {})[file_path] = scope
+
+        self.files[file_path] = IndexedFile(
+            category, stat.st_size, stat.st_mtime_ns,
+            gpo.guid if gpo is not None else None, scope)
+
+    def to_dict(self) -> dict:
+        """Return the index as a JSON serializable dictionary."""
+        gpos = {}
+        for gpo in self.gpos.values():
+            gpos[gpo.guid] = gpo.to_dict()
+            del gpos[gpo.guid]["files"]
+        return {
+            "gpo_path": self.gpo_path,
+            "selection": sorted(self.selection),
+            "gpos": gpos,
+            # One [path, category, size, mtime_ns, guid, scope] row per file
+            "files": [[path, *entry] for path, entry in self.files.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, filenames: dict):
+        """
+        Restore an index from the output of `to_dict`, without walking.
+
+        Args:
+            data (dict): The output of `to_dict`.
+            filenames (dict): A dictionary mapping each category to its filenames.
+
+        Returns:
+            GPOIndex: The restored index.
+        """
+        index = cls(data["gpo_path"], filenames, selection=data["selection"])
+        index.gpos = {guid: GPOInfo.from_dict(gpo) for guid, gpo in data["gpos"].items()}
+
+        for path, *fields in data["files"]:
+            entry = IndexedFile(*fields)
+            index.files[path] = entry
+            if entry.guid in index.gpos:
+                index.gpos[entry.guid].files.setdefault(entry.category, {})[path] = entry.scope
+
+        return index
+
+    def category_files(self, category: str) -> list:
+        """Return the files of a category, by size in descending order, then by path."""
+        file_paths = [path for path, entry in self.files.items() if entry.category == category]
+        file_paths.sort(key=lambda path: (-self.files[path].size, path))
+        return file_paths
+
+    def gpo_of(self, file_path: str) -> GPOInfo:
+        """Return the GPO a file belongs to, or None."""
+        entry = self.files.get(file_path)
+        if entry is None or entry.guid is None:
+            return None
+        return self.gpos.get(entry.guid)
@@ -0,0 +1,120 @@
+"""This module provides the GPOAnalyzer findings rules."""
+# gpoanalyzer/gpo_rules.py
+
+# Each rule matches a single extracted entry of its category: an extracted
+# XML element, a Registry.pol row or a whole GptTmpl.inf file. `match` maps
+# dotted field paths, as in `gpo_value_paths`, to conditions that must all
+# hold. Supported conditions: present, equals, regex, lt, gt.
+# The first field of `match` is the one reported in the finding.
+gpo_rules = {
+    "groups": [
+        {
+            "id": "GPP-CPASSWORD",
+            "title": "Group Policy Preferences password (MS14-025)",
+            "severity": "high",
+            "match": {"cpassword": {"present": True}},
+        },
+        {
+            "id": "GROUPS-PRIVILEGED-MEMBERSHIP",
+            "title": "Members configured for a privileged local group",
+            "severity": "medium",
+            "match": {
+                "name": {"regex": r"^(Administrators|Backup Operators|Remote Desktop Users"
+                                  r"|Remote Management Users|Hyper-V Administrators)\b"},
+                "member": {"present": True},
+            },
+        },
+        {
+            "id": "GROUPS-ACCOUNT-NEVER-EXPIRES",
+            "title": "Local account password never expires",
+            "severity": "low",
+            "match": {"neverExpires": {"equals": "1"}},
+        },
+    ],
+    "scheduledtasks": [
+        {
+            "id": "TASK-PRIVILEGED-PRINCIPAL",
+            "title": "Scheduled task running as a privileged account",
+            "severity": "medium",
+            "match": {"runAs": {"regex": r"(^|\\)(SYSTEM|Administrator)$|^S-1-5-18$"}},
+        },
+        {
+            "id": "TASK-UNC-COMMAND",
+            "title": "Scheduled task running a command from a network share",
+            "severity": "medium",
+            "match": {"command": {"regex": r"^\\\\"}},
+        },
+    ],
+    "drives": [
+        {
+            "id": "DRIVE-STORED-USERNAME",
+            "title": "Mapped drive configured with explicit credentials",
+            "severity": "low",
+            "match": {"userName": {"present": True}},
+        },
+    ],
+    "registrypol": [
+        {
+            "id": "REG-ALWAYS-INSTALL-ELEVATED",
+            "title": "Windows Installer always installs with elevated privileges",
+            "severity": "high",
+            "match": {
+                "Data": {"equals": "0x00000001"},
+                "Key": {"regex": r"\\Windows\\Installer$"},
+                "Value": {"equals": "AlwaysInstallElevated"},
+            },
+        },
+        {
+            "id": "REG-WDIGEST-CLEARTEXT",
+            "title": "WDigest keeps cleartext credentials in memory",
+            "severity": "high",
+            "match": {
+                "Data": {"equals": "0x00000001"},
+                "Key": {"regex": r"\\WDigest$"},
+                "Value": {"equals": "UseLogonCredential"},
+            },
+        },
+        {
+            "id": "REG-AUTOLOGON-PASSWORD",
+            "title": "Autologon password stored in the registry",
+            "severity": "high",
+            "match": {
+                "Data": {"present": True},
+                "Key": {"regex": r"\\Winlogon$"},
+                "Value": {"equals": "DefaultPassword"},
+            },
+        },
+    ],
+    "gpttmpl": [
+        {
+            "id": "INF-CLEARTEXT-PASSWORD",
+            "title": "Passwords stored using reversible encryption",
+            "severity": "high",
+            "match": {"System Access.ClearTextPassword": {"equals": "1"}},
+        },
+        {
+            "id": "INF-SHORT-PASSWORD",
+            "title": "Minimum password length below 14 characters",
+            "severity": "medium",
+            "match": {"System Access.MinimumPasswordLength": {"lt": 14}},
+        },
+        {
+            "id": "INF-NO-COMPLEXITY",
+            "title": "Password complexity disabled",
+            "severity": "medium",
+            "match": {"System Access.PasswordComplexity": {"equals": "0"}},
+        },
+        {
+            "id": "INF-NO-LOCKOUT",
+            "title": "Account lockout disabled",
+            "severity": "medium",
+            "match": {"System Access.LockoutBadCount": {"equals": "0"}},
+        },
+        {
+            "id": "INF-ANONYMOUS-SID-LOOKUP",
+            "title": "Anonymous SID/name translation allowed",
+            "severity": "low",
+            "match": {"System Access.LSAAnonymousNameLookup": {"equals": "1"}},
+        },
+    ],
+}
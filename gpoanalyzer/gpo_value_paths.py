@@ -234,6 +234,22 @@ gpo_value_paths = {
         "value": "Collection.Registry.Properties.value",
         "Reg": "Properties.Reg",
     },
+    "networkshares": {
+        # "clsid": "clsid",
+        "name": "name",
+        "status": "status",
+        "changed": "changed",
+        # "uid": "uid",
+        "action": "Properties.action",
+        "path": "Properties.path",
+        "comment": "Properties.comment",
+        # "allRegular": "Properties.allRegular",
+        # "allHidden": "Properties.allHidden",
+        # "allAdminDrive": "Properties.allAdminDrive",
+        "limitUsers": "Properties.limitUsers",
+        # "userLimit": "Properties.userLimit",
+        "abe": "Properties.abe"
+    },
     "registrypol": "",
     "gpttmpl": ""
 }
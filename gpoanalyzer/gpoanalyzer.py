@@ -1,74 +1,69 @@
 """Main module for GPOAnalyzer."""
 # gpoanalyzer/gpoanalyzer.py
 
-import os
 import re
-from gpoanalyzer.parse.inf_files import INFParser
-from gpoanalyzer.parse.pol_files import POLParser
-from gpoanalyzer.parse.xml_files import XMLParser
-from gpoanalyzer.gpo_value_paths import gpo_value_paths
-
-from gpoanalyzer.common import (
-    list_files,
-    extract_data,
-)
-
-FILENAMES = {
-    "shortcuts": "shortcuts.xml",
-    "scheduledtasks": "scheduledtasks.xml",
-    "drives": "drives.xml",
-    "groups": "groups.xml",
-    "printers": "printers.xml",
-    "registryxml": "registry.xml",
-    "envvars": "environmentvariables.xml",
-    "files": "files.xml",
-    "services": "services.xml",
-    "folders": "folders.xml",
-    "internetsettings": "internetsettings.xml",
-    "registrypol": "registry.pol",
-    "gpttmpl": "gpttmpl.inf",
-}
-
-
-def get_parser(parser_type):
-    """
-    A factory method for creating parser instances based on the file type.
+from collections.abc import Mapping
+from gpoanalyzer.parse.limits import ParseLimits, ParserError
+from gpoanalyzer.admx import PolicyIndex
+from gpoanalyzer.findings import FindingsEngine
+from gpoanalyzer.gpo_index import GPOIndex
+from gpoanalyzer.plugins import PLUGINS, ParserRegistry
+from gpoanalyzer.progress import ParseProgress
+from gpoanalyzer.search import Match, MultiPatternMatcher
+
 
-    This method provides a method to create different types of parsers
-    depending on the file extension provided. It supports parsers for XML, POL,
-    and INF file types.
+def merge_file_results(arg, file_results, plugins: ParserRegistry = PLUGINS):
+    """
+    Combine the per-file results of an aggregated argument.
 
-    Supported file types:
-        - .xml: Uses `XMLParser`
-        - .pol: Uses `POLParser`
-        - .inf: Uses `INFParser`
+    Args:
+        arg (str): The aggregated argument, whose plugin sets `aggregate`.
+        file_results (list): The `parse_file` results, in discovery order.
+        plugins (ParserRegistry): The registry the plugin of `arg` is read from.
 
-    Example usage:
-        parser = ParserFactory(".xml")
-        parser.parse("path/to/file.xml")
+    Returns:
+        dict: The same result `parse` produces for all the files at once.
     """
-    parsers = {
-        ".xml": XMLParser,
-        ".pol": POLParser,
-        ".inf": INFParser,
-    }
-    parser_class = parsers.get(parser_type)
-    if parser_class:
-        return parser_class()
-    raise ValueError("Invalid parser type: No parser found!")
-
-
-class GPOAnalyzer:
+    return plugins.get(arg).merge_files(file_results)
+
+
+class GPOAnalyzer:  # pylint: disable=too-many-instance-attributes
     """Class for analyzing Group Policy Objects (GPOs)."""
 
-    def __init__(self, gpo_file_path: str) -> None:
+    def __init__(self, gpo_file_path: str, findings: FindingsEngine = None,
+                 limits: ParseLimits = None, policy_index: PolicyIndex = None,
+                 xml_backend: str = "auto") -> None:
         """Initialize the GPOAnalyzer instance.
 
         Args:
             gpo_file_path (str): The path to the GPO files.
+            findings (FindingsEngine): An optional findings engine, evaluated
+                                       on the data of each parsed file.
+            limits (ParseLimits): Optional per-file byte and time budgets.
+            policy_index (PolicyIndex): An optional ADMX index used to annotate
+                                        Registry.pol rows with policy names.
+            xml_backend (str): The XML backend: "auto", "lxml" or "stdlib".
         """
         self.gpo_file_path = gpo_file_path
-        self.gpo_value_paths = gpo_value_paths
+        # Parser plugins of the supported files, by category
+        self.plugins = PLUGINS
+        self.findings = findings
+        self.limits = limits
+        self.policy_index = policy_index
+        self.xml_backend = xml_backend
+        # Optional progress display, updated as files are discovered and parsed
+        self.progress: ParseProgress = None
+        # Optional GUIDs or display names of the GPOs to discover
+        self.gpo_selection = None
+        # Index built by the last discovery of the GPO directory
+        self.index: GPOIndex = None
+        # Optional `Snapshot` the results are read from instead of the files
+        self.snapshot = None
+        # Files skipped because they could not be parsed within the limits
+        self.skipped = []
+        # Optional dictionary filled with the results of each file of the
+        # aggregated arguments, by argument and file path
+        self.file_results = None
 
     def parse(self, user_args):
         """
@@ -87,108 +82,355 @@ class GPOAnalyzer:
                   by the user arguments and file paths.
 
         Notes:
-            - If an argument in `user_args` is not in `self.gpo_value_paths`, it is skipped.
-            - The method retrieves file paths using the `list_files` function and
-              parses the files using the appropriate parser from `ParserFactory`.
+            - If an argument in `user_args` has no plugin in `self.plugins`, it is skipped.
+            - The method retrieves file paths from a `GPOIndex` of the GPO directory
+              and parses the files using the parser of the argument's plugin.
             - The extracted data for each file is processed and organized in the
               `results` dictionary, with file paths as keys.
         """
         results = {}
 
+        # Discover the files of all arguments in a single walk
+        index = self.build_index()
+        file_paths = {arg: self.discover(arg, index) for arg in user_args}
+
         # Iterate over each user-provided argument
         for arg in user_args:
-            # Skip arguments not present in the configuration
-            if arg not in self.gpo_value_paths:
-                continue
+            arg_results = self.parse_arg(arg, file_paths.get(arg))
+            if arg_results is not None:
+                results[arg] = arg_results
 
-            # Retrieve the filename associated with the current argument
-            filename = FILENAMES.get(arg)
-            # Extract the file extension from the filename
-            _, file_ext = os.path.splitext(filename)
+        return results
 
-            # Get the appropriate parser based on the file extension
-            parser = get_parser(file_ext)
+    def parse_lazy(self, user_args):
+        """
+        Return a lazy mapping of the results of the user-provided arguments.
 
-            # Retrieve file paths using the `list_files` function
-            file_paths = list_files(
-                gpo_path=self.gpo_file_path, target_filename=filename)
+        The files of an argument are discovered, parsed and extracted the first
+        time the argument is accessed, so callers only pay for what they read.
 
-            # If no file paths are found, skip to the next argument
-            if not file_paths:
-                continue
+        Args:
+            user_args (list): A list of arguments provided by the user indicating
+                              which files to parse.
+
+        Returns:
+            LazyResults: A read-only mapping with the same content as `parse`.
+        """
+        # Discovery is cheap next to parsing, so the files of all arguments
+        # are discovered up front in a single walk
+        index = self.build_index()
+        file_paths = {arg: self.discover(arg, index) for arg in dict.fromkeys(user_args)}
+        return LazyResults(lambda arg: self.parse_arg(arg, file_paths.get(arg)), user_args)
+
+    def build_index(self) -> GPOIndex:
+        """
+        Walk the GPO directory and index its GPOs and supported files.
+
+        Only the GPOs in `gpo_selection` are walked when it is set. The index
+        of the loaded snapshot is returned as is.
+
+        Returns:
+            GPOIndex: The new index, also kept in `self.index`.
+        """
+        if self.snapshot is not None:
+            # A loaded snapshot is never walked again
+            self.index = self.snapshot.index
+            return self.index
+
+        self.index = GPOIndex(self.gpo_file_path, self.plugins.filenames(),
+                              selection=self.gpo_selection)
+        self.index.build()
+        return self.index
+
+    def discover(self, arg, index: GPOIndex = None):
+        """
+        List the files of a single argument.
+
+        Args:
+            arg (str): The argument indicating which files to list.
+            index (GPOIndex): The index to list the files from. The GPO
+                              directory is indexed again if None.
+
+        Returns:
+            list: The file paths, largest first, or an empty list if the
+                  argument is unknown or no file was found.
+        """
+        if arg not in self.plugins:
+            return []
+
+        if index is None:
+            index = self.build_index()
+        file_paths = index.category_files(arg)
+
+        if self.progress is not None:
+            self.progress.discovered(arg, file_paths)
 
-            # Special case handling for specific argument types
-            if arg in ["registrypol", "gpttmpl"]:
-                results[arg] = parser.parse(file_paths)
+        return file_paths
+
+    def parse_arg(self, arg, file_paths=None):
+        """
+        Discover, parse and extract the files of a single argument.
+
+        Args:
+            arg (str): The argument indicating which files to parse.
+            file_paths (list): The files of the argument, as returned by
+                               `discover`. They are discovered if None.
+
+        Returns:
+            The value stored under `results[arg]` by `parse`, or None if
+            the argument is unknown or no data was found.
+        """
+        # Skip arguments without a parser plugin
+        if arg not in self.plugins:
+            return None
+
+        # Results of a loaded snapshot are used without parsing
+        if self.snapshot is not None:
+            if self.file_results is not None and arg in self.snapshot.file_results:
+                self.file_results.update({arg: self.snapshot.file_results[arg]})
+            return self.snapshot.results.get(arg)
+
+        # Retrieve file paths from a new index of the GPO directory
+        if file_paths is None:
+            file_paths = self.discover(arg)
+
+        # If no file paths are found, there is no data for this argument
+        if not file_paths:
+            return None
+
+        try:
+            return self.parse_files(arg, file_paths, self.create_parser(arg))
+        finally:
+            # Leave the terminal clean for the output of the argument
+            if self.progress is not None:
+                self.progress.clear()
+
+    def create_parser(self, arg):
+        """Create a parser of the argument's plugin with the analyzer's limits."""
+        return self.plugins.get(arg).create_parser(
+            limits=self.limits, options={"backend": self.xml_backend})
+
+    def parse_files(self, arg, file_paths, parser):
+        """Parse and extract the discovered files of a single argument."""
+        # Files of aggregated arguments are parsed into a single result
+        if self.plugins.get(arg).aggregate:
+            if self.findings is not None or self.file_results is not None:
+                # Parse file by file so findings and results keep their source path
+                file_results = {}
+                for file_path in file_paths:
+                    file_results[file_path] = self.parse_file(arg, file_path)
+                    self.report_parsed(arg, [file_path])
+                if self.file_results is not None:
+                    self.file_results[arg] = file_results
+                return merge_file_results(arg, list(file_results.values()), self.plugins)
+            arg_results = parser.parse(file_paths)
+            self.record_skipped(arg, parser.skipped)
+            self.annotate(arg, arg_results)
+            self.report_parsed(arg, file_paths)
+            return arg_results
+
+        arg_results = None
+
+        # Process each file path
+        for file_path in file_paths:
+            # Parse the file and extract the relevant data
+            tmp_list = self.parse_file(arg, file_path, parser=parser)
+            self.report_parsed(arg, [file_path])
+
+            # If parsing fails or returns no data, skip to the next file
+            if tmp_list is None:
                 continue
 
-            # Process each file path
-            for file_path in file_paths:
-                # Parse the file using the appropriate parser
+            # Initialize the results dictionary for the argument if not already present
+            if arg_results is None:
+                arg_results = {}
+
+            # If extracted data is found, add it to the results dictionary
+            if tmp_list:
+                arg_results[file_path] = tmp_list
+
+        return arg_results
+
+    def parse_file(self, arg, file_path, parser=None):
+        """
+        Parse a single file for the given argument.
+
+        Args:
+            arg (str): The argument indicating the file type.
+            file_path (str): The path of the file to parse.
+            parser (object): An optional parser instance to reuse. Parsers of
+                             aggregated arguments keep state and are always
+                             created anew.
+
+        Returns:
+            The extracted values stored under `results[arg][file_path]` by
+            `parse`, or None if the file holds no data. For aggregated
+            arguments the parser output for this file alone is returned,
+            to be combined with `merge_file_results`.
+        """
+        plugin = self.plugins.get(arg)
+        if plugin.aggregate or parser is None:
+            parser = self.create_parser(arg)
+
+        if plugin.aggregate:
+            file_result = parser.parse([file_path])
+            self.record_skipped(arg, parser.skipped)
+            self.annotate(arg, file_result)
+        else:
+            # Parse the file using the appropriate parser
+            try:
                 data = parser.parse(file_path)
+            except (OSError, ParserError) as e:
+                self.record_skipped(arg, [(file_path, str(e))])
+                return None
+            if not data:
+                return None
 
-                # If parsing fails or returns no data, skip to the next file
-                if not data:
-                    continue
+            # Extract relevant data from the parsed file
+            file_result = plugin.extract_file(data)
 
-                # Extract relevant data from the parsed file
-                extracted_data = extract_data(
-                    data, self.gpo_value_paths.get(arg))
+        # Evaluate the findings rules on the freshly extracted data
+        if self.findings is not None:
+            self.findings.evaluate(arg, file_result, source=file_path)
 
-                # Initialize the results dictionary for the argument if not already present
-                if arg not in results:
-                    results[arg] = {}
+        return file_result
 
-                # List comprehension to hold extracted values excluding the 'clsid' key
-                tmp_list = [values for key,
-                            values in extracted_data.items() if key != "clsid"]
+    def report_parsed(self, arg, file_paths):
+        """Update the progress display with files that were parsed."""
+        if self.progress is not None:
+            self.progress.parsed(arg, file_paths)
 
-                # If extracted data is found, add it to the results dictionary
-                if tmp_list:
-                    results[arg][file_path] = tmp_list
+    def annotate(self, arg, data):
+        """Annotate Registry.pol rows with policy names from the ADMX index."""
+        if self.policy_index is not None and self.plugins.get(arg).annotate:
+            self.policy_index.annotate(data)
 
-        return results
+    def record_skipped(self, arg, skipped):
+        """Record the (file path, reason) tuples of files skipped by a parser."""
+        for file_path, reason in skipped:
+            self.skipped.append({"category": arg, "path": file_path, "reason": reason})
 
-    def find(self, data, search_term: str):
+    def find(self, data, search_term: str, max_results: int = None):
         """
         Search for a string or regex pattern within a nested dictionary.
 
+        Matches are yielded as soon as they are found, so callers can stop
+        the search early by closing the generator.
+
         Args:
             data (dict): The nested dictionary to search within.
             search_term (str or pattern): The string or regex pattern to search for.
+            max_results (int): Stop after yielding this many matches.
 
-        Returns:
-            dict: A dictionary where the keys are the positions of the matched elements
-                and the values are the corresponding sub-dictionaries 
-                or sub-lists containing the match.
+        Yields:
+            Match: The position of the matched string and its value.
         """
-        matches = {}
-
         # Compile the search pattern case insensitivity
         search_pattern = re.compile(search_term, re.IGNORECASE)
 
-        def search_recursive(dictionary, path):
-            for key, value in dictionary.items():
-                current_path = path + [key]
-                if isinstance(value, dict):
-                    search_recursive(value, current_path)
-                elif isinstance(value, list):
-                    search_in_list(value, current_path)
-                elif isinstance(value, str):
-                    if search_pattern.search(value):
-                        matches[tuple(path)] = dictionary
-
-        def search_in_list(lst, path):
-            for idx, item in enumerate(lst):
-                current_path = path + [idx]
-                if isinstance(item, dict):
-                    search_recursive(item, current_path)
-                elif isinstance(item, list):
-                    search_in_list(item, current_path)
-                elif isinstance(item, str):
-                    if search_pattern.search(item):
-                        matches[tuple(path)] = lst
-
-        search_recursive(data, [])
-
-        return matches
+        count = 0
+        for path, value in iter_strings(data):
+            if search_pattern.search(value):
+                count += 1
+                yield Match(path=path, value=value)
+                # Stop before the walk reaches the next string, or category
+                if count == max_results:
+                    return
+
+    def find_many(self, data, matcher: MultiPatternMatcher, max_results: int = None):
+        """
+        Search for many terms within a nested dictionary in a single pass.
+
+        Every string in `data` is evaluated exactly once against `matcher`.
+
+        Args:
+            data (dict): The nested dictionary to search within.
+            matcher (MultiPatternMatcher): The combined literal and regex matcher.
+            max_results (int): Stop after yielding this many matches.
+
+        Yields:
+            Match: The position of the matched string, its value and the
+                term that matched it. A string matching several terms is
+                yielded once per term.
+        """
+        count = 0
+        for path, value in iter_strings(data):
+            for term in matcher.match(value):
+                count += 1
+                yield Match(path=path, value=value, term=term)
+                # Stop before the walk reaches the next term, string or category
+                if count == max_results:
+                    return
+
+
+class LazyResults(Mapping):
+    """
+    Read-only mapping computing the results of each argument on first access.
+
+    It holds the same keys and values as the dictionary returned by
+    `GPOAnalyzer.parse`. Computed values are memoized, and iterating yields
+    the arguments one at a time, computing each only when reached.
+    """
+
+    def __init__(self, compute, user_args) -> None:
+        """Initialize the LazyResults instance.
+
+        Args:
+            compute (callable): Returns the results of a single argument, or
+                                None if there is no data for it.
+            user_args (list): The arguments, in output order.
+        """
+        self.compute = compute
+        self.user_args = list(dict.fromkeys(user_args))
+        self.computed = {}
+
+    def load(self, arg):
+        """Compute and memoize the results of an argument."""
+        if arg not in self.computed:
+            self.computed[arg] = self.compute(arg)
+        return self.computed[arg]
+
+    def __getitem__(self, arg):
+        if arg not in self.user_args or self.load(arg) is None:
+            raise KeyError(arg)
+        return self.computed[arg]
+
+    def __iter__(self):
+        for arg in self.user_args:
+            if self.load(arg) is not None:
+                yield arg
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __bool__(self):
+        return any(True for _ in self)
+
+    def __repr__(self):
+        computed = [arg for arg in self.user_args if arg in self.computed]
+        return f"LazyResults(args={self.user_args!r}, computed={computed!r})"
+
+    def to_dict(self) -> dict:
+        """Compute all arguments and return the results as a plain dictionary."""
+        return dict(self.items())
+
+
+def iter_strings(data, path=()):
+    """
+    Walk a nested dictionary and yield every string value it contains.
+
+    Args:
+        data (dict or list): The nested dictionary or list to walk.
+        path (tuple): The position of `data` within the outermost object.
+
+    Yields:
+        tuple: The position of the string value as a tuple of keys and
+            list indexes, and the string value.
+    """
+    items = data.items() if isinstance(data, Mapping) else enumerate(data)
+
+    for key, value in items:
+        if isinstance(value, (dict, list)):
+            yield from iter_strings(value, path + (key,))
+        elif isinstance(value, str):
+            yield path + (key,), value
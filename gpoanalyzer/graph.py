@@ -0,0 +1,188 @@
+"""Graph export of group memberships and task principals for GPOAnalyzer."""
+# gpoanalyzer/graph.py
+
+import csv
+import json
+from typing import NamedTuple
+
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer
+from gpoanalyzer.gpo_index import GUID_PATTERN, GPOIndex, normalize_guid
+from gpoanalyzer.plugins import iter_extracted
+
+GRAPH_FORMATS = ("csv", "ndjson")
+
+# Categories the graph is extracted from
+GRAPH_ARGS = ("groups", "scheduledtasks")
+
+CSV_COLUMNS = ("source", "target", "relation", "gpo", "action", "path")
+
+
+class Node(NamedTuple):
+    """A graph node, identified by its kind and name."""
+    id: str
+    kind: str
+    name: str
+    sid: str = None
+
+
+class Edge(NamedTuple):
+    """A graph edge between two node ids."""
+    source: str
+    target: str
+    relation: str
+    gpo: str
+    action: str
+    path: str
+
+
+def make_node(kind: str, name: str, sid: str = None, scope: str = None) -> Node:
+    """Create a node whose id is unique within `scope`, or globally if None."""
+    node_id = f"{kind}:{scope}:{name}" if scope else f"{kind}:{name}"
+    return Node(node_id, kind, name, sid)
+
+
+def as_list(value) -> list:
+    """Return a repeated element as a list, whether it occurs once or more."""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def group_graph(gpo: Node, file_path: str, entry: dict):
+    """Yield the nodes and edges of a Groups.xml group entry."""
+    # Groups.xml also creates local users, which are not groups
+    if not entry.get("name") or entry.get("userName"):
+        return
+
+    gpo_id = gpo.id if gpo is not None else None
+    group = make_node("group", entry["name"])
+    yield group
+    if gpo is not None:
+        yield Edge(gpo.id, group.id, "configures", gpo_id, None, file_path)
+
+    for member in as_list(entry.get("member")):
+        if not isinstance(member, dict) or not (member.get("name") or member.get("sid")):
+            continue
+        principal = make_node("principal", member.get("name") or member["sid"],
+                              sid=member.get("sid"))
+        yield principal
+        yield Edge(principal.id, group.id, "member_of", gpo_id, member.get("action"), file_path)
+
+
+def task_graph(gpo: Node, file_path: str, entry: dict):
+    """Yield the nodes and edges of a ScheduledTasks.xml task entry."""
+    if not entry.get("name"):
+        return
+
+    # Task names are only unique within their GPO
+    gpo_id = gpo.id if gpo is not None else None
+    task = make_node("task", entry["name"], scope=gpo_id or file_path)
+    yield task
+    if gpo is not None:
+        yield Edge(gpo.id, task.id, "configures", gpo_id, entry.get("action"), file_path)
+
+    if entry.get("runAs"):
+        principal = make_node("principal", entry["runAs"])
+        yield principal
+        yield Edge(task.id, principal.id, "runs_as", gpo_id, entry.get("logonType"), file_path)
+
+
+def gpo_node(index: GPOIndex, file_path: str) -> Node:
+    """Return the node of the GPO a file belongs to, or None."""
+    gpo = index.gpo_of(file_path)
+    if gpo is not None:
+        return Node(f"gpo:{gpo.guid}", "gpo", gpo.display_name or gpo.guid)
+    guid = GUID_PATTERN.search(file_path)
+    if guid:
+        return make_node("gpo", normalize_guid(guid.group(0)))
+    return None
+
+
+class GraphWriter:
+    """Write graph records incrementally as CSV edge lists or NDJSON.
+
+    Records are written as soon as the data of a file is extracted. Nodes
+    are only deduplicated within a file, so memory does not grow with the
+    size of the domain; consumers merge nodes on their id.
+    """
+
+    def __init__(self, stream, graph_format: str = "ndjson") -> None:
+        """Initialize the GraphWriter instance.
+
+        Args:
+            stream (file): The text stream the records are written to.
+            graph_format (str): "csv" for an edge list, "ndjson" for nodes
+                                and edges as JSON lines.
+        """
+        if graph_format not in GRAPH_FORMATS:
+            raise ValueError(f"Invalid graph format: {graph_format}")
+        self.stream = stream
+        self.edges = 0
+        self.csv_writer = None
+        if graph_format == "csv":
+            self.csv_writer = csv.writer(stream, lineterminator="\n")
+            self.csv_writer.writerow(CSV_COLUMNS)
+
+    def write_file(self, category: str, file_path: str, gpo: Node, data):
+        """Write the nodes and edges of the extracted data of a file."""
+        graph = group_graph if category == "groups" else task_graph
+        seen = set()
+
+        if gpo is not None:
+            self.write_node(gpo, seen)
+
+        for _, entry in iter_extracted(data or [], file_path):
+            for record in graph(gpo, file_path, entry):
+                if isinstance(record, Node):
+                    self.write_node(record, seen)
+                else:
+                    self.write_edge(record)
+
+    def write_node(self, node: Node, seen: set):
+        """Write a node, once per file."""
+        if node.id in seen or self.csv_writer is not None:
+            return
+        seen.add(node.id)
+        record = {"type": "node", **node._asdict()}
+        self.stream.write(json.dumps(record) + "\n")
+
+    def write_edge(self, edge: Edge):
+        """Write an edge."""
+        self.edges += 1
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(edge)
+        else:
+            self.stream.write(json.dumps({"type": "edge", **edge._asdict()}) + "\n")
+
+
+def export_graph(analyzer: GPOAnalyzer, writer: GraphWriter) -> int:
+    """
+    Extract the group and task graph of a GPO directory and write it.
+
+    Each file is parsed, extracted and written before the next one is read,
+    and its data is then dropped, instead of building the full results.
+
+    Args:
+        analyzer (GPOAnalyzer): The analyzer used to discover and parse the files.
+        writer (GraphWriter): The writer the graph is written to.
+
+    Returns:
+        int: The number of written edges.
+    """
+    index = analyzer.build_index()
+
+    for arg in GRAPH_ARGS:
+        if analyzer.snapshot is not None:
+            file_data = (analyzer.snapshot.results.get(arg) or {}).items()
+        else:
+            file_data = ((file_path, analyzer.parse_file(arg, file_path))
+                         for file_path in analyzer.discover(arg, index))
+
+        for file_path, data in file_data:
+            writer.write_file(arg, file_path, gpo_node(index, file_path), data)
+            analyzer.report_parsed(arg, [file_path])
+
+        if analyzer.progress is not None:
+            analyzer.progress.clear()
+
+    return writer.edges
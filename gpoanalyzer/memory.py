@@ -0,0 +1,102 @@
+"""Memory profiling for GPOAnalyzer."""
+# gpoanalyzer/memory.py
+
+import linecache
+import tracemalloc
+from contextlib import contextmanager
+from typing import NamedTuple
+
+# Number of allocation sites reported per phase
+TOP_SITES = 10
+
+
+class AllocationSite(NamedTuple):
+    """Memory allocated by a source line during a phase and still held at its end."""
+    filename: str
+    lineno: int
+    size: int
+    count: int
+
+    def format_site(self) -> str:
+        """Return the site as 'file:line  source'."""
+        source = linecache.getline(self.filename, self.lineno).strip()
+        return f"{self.filename}:{self.lineno}  {source}"
+
+
+class PhaseReport(NamedTuple):
+    """Memory usage of a profiled phase."""
+    name: str
+    # Highest traced memory during the phase, in bytes
+    peak: int
+    # Traced memory added by the phase and still held at its end, in bytes
+    retained: int
+    sites: list
+
+
+class MemoryProfiler:
+    """Measure peak memory and top allocation sites of successive phases.
+
+    Memory is traced with `tracemalloc`, which slows the run down noticeably.
+    Per-phase peaks need `tracemalloc.reset_peak` (Python 3.9+); on older
+    versions the peak of a phase includes the phases before it.
+    """
+
+    def __init__(self, top: int = TOP_SITES) -> None:
+        """Initialize the MemoryProfiler instance.
+
+        Args:
+            top (int): The number of allocation sites reported per phase.
+        """
+        self.top = top
+        self.phases = []
+
+    def start(self):
+        """Start tracing memory allocations."""
+        tracemalloc.start()
+
+    def stop(self):
+        """Stop tracing memory allocations."""
+        tracemalloc.stop()
+
+    @property
+    def peak(self) -> int:
+        """The highest peak of all phases, in bytes."""
+        return max((phase.peak for phase in self.phases), default=0)
+
+    def take_snapshot(self):
+        """Take a snapshot of the traced allocations, without the profiler's own."""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, linecache.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    @contextmanager
+    def phase(self, name: str):
+        """Profile the code run within the context as a phase."""
+        reset_peak = getattr(tracemalloc, "reset_peak", None)
+        start_size = tracemalloc.get_traced_memory()[0]
+        before = self.take_snapshot()
+        # The reference snapshot is itself traced and held during the phase
+        overhead = tracemalloc.get_traced_memory()[0] - start_size
+        if reset_peak is not None:
+            reset_peak()
+
+        try:
+            yield
+        finally:
+            size, peak = tracemalloc.get_traced_memory()
+            stats = self.take_snapshot().compare_to(before, "lineno")
+            sites = [AllocationSite(stat.traceback[0].filename, stat.traceback[0].lineno,
+                                    stat.size_diff, stat.count_diff)
+                     for stat in stats if stat.size_diff > 0]
+            sites.sort(key=lambda site: site.size, reverse=True)
+            self.phases.append(PhaseReport(
+                name, peak - overhead, size - start_size - overhead, sites[:self.top]))
+
+    def to_dict(self) -> list:
+        """Return the phase reports as a JSON serializable list."""
+        return [{"phase": phase.name, "peak": phase.peak, "retained": phase.retained,
+                 "sites": [{**site._asdict(), "source": site.format_site()}
+                           for site in phase.sites]}
+                for phase in self.phases]
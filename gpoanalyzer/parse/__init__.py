@@ -0,0 +1,6 @@
+"""Parsers of the supported GPO files."""
+# gpoanalyzer/parse/__init__.py
+
+# Backends of `XMLParser`, declared here so that they are known without
+# importing the XML parser and its optional lxml dependency
+XML_BACKENDS = ("auto", "lxml", "stdlib")
@@ -3,12 +3,16 @@
 
 import re
 
+from gpoanalyzer.parse.limits import NO_LIMITS, ParseLimits, ParserError
+
 
 class INFParser:
     """Class to parse GtpTmpl.inf files and extract relevant data."""
 
-    def __init__(self) -> None:
+    def __init__(self, limits: ParseLimits = None) -> None:
         self.results = {}
+        self.skipped = []
+        self.limits = limits or NO_LIMITS
         # Regular expressions to identify sections and key/value pairs
         self.section_pattern = re.compile(r"\[\s*(.*?)\s*\]")
         self.key_value_pattern = re.compile(r"(\S+)\s*=\s*(.*)")
@@ -16,9 +20,13 @@ class INFParser:
     def read_file(self, file):
         """Read an INF file and populate the results dictionary with its contents."""
         current_section = None
+        file_results = {}
+        deadline = self.limits.start(file)
 
         with open(file, 'r', encoding='utf-16') as f:
-            for line in f:
+            for count, line in enumerate(f):
+                if count % self.limits.check_interval == 0:
+                    deadline.check()
                 line = line.strip()
                 # Ignore empty lines or comments
                 if not line or line.startswith(';'):
@@ -29,22 +37,42 @@ class INFParser:
                 if section_match:
                     # Extract the section name
                     current_section = section_match.group(1)
-                    if current_section not in self.results:
-                        self.results[current_section] = {}
+                    if current_section not in file_results:
+                        file_results[current_section] = {}
 
-                else:
+                elif current_section is not None:
                     # Otherwise, it should be a key/value pair
                     key_value_match = self.key_value_pattern.match(line)
                     if key_value_match:
                         key, value = key_value_match.groups()
-                        self.results[current_section][key] = value
+                        file_results[current_section][key] = value
+
+        # Merge only fully read files into the results
+        for section, values in file_results.items():
+            self.results.setdefault(section, {}).update(values)
 
     def parse(self, file_paths: str) -> dict:
-        """Parse GtpTmpl.inf files and extract relevant data."""
-        try:
-            for file in file_paths:
+        """Parse GtpTmpl.inf files and extract relevant data.
+
+        Files that cannot be read or parsed within the limits are skipped
+        and recorded in `self.skipped` as (file path, reason) tuples.
+        """
+        for file in file_paths:
+            try:
                 self.read_file(file)
-        except OSError as e:
-            print("Exception: an error occur in INFParser:", e)
+            except UnicodeError as e:
+                self.skipped.append((file, f"Invalid UTF-16 content: {e}"))
+            except (OSError, ParserError) as e:
+                self.skipped.append((file, str(e)))
 
         return self.results
+
+
+def merge_sections(file_results: list) -> dict:
+    """Merge the results of several GptTmpl.inf files section by section."""
+    merged = {}
+    for data in file_results:
+        for section, values in (data or {}).items():
+            # Sections spread over several files are merged key by key
+            merged.setdefault(section, {}).update(values)
+    return merged
@@ -0,0 +1,90 @@
+"""Parser for Scripts.ini and psscripts.ini files."""
+# gpoanalyzer/parse/ini_files.py
+
+import re
+
+from gpoanalyzer.parse.limits import NO_LIMITS, ParseLimits, ParserError
+
+# Keys of a script, prefixed with its position in the section: "0CmdLine"
+SCRIPT_KEY_PATTERN = re.compile(r"(\d+)(CmdLine|Parameters)", re.IGNORECASE)
+
+
+class ScriptsParser:  # pylint: disable=too-few-public-methods
+    """Class to parse Scripts.ini and psscripts.ini files into their sections."""
+
+    def __init__(self, limits: ParseLimits = None) -> None:
+        self.skipped = []
+        self.limits = limits or NO_LIMITS
+
+    def parse(self, file_path: str) -> dict:
+        """Parse a scripts file into a dictionary of sections and key/value pairs.
+
+        Raises `ParserError` if the file cannot be decoded or exceeds the limits.
+        """
+        deadline = self.limits.start(file_path)
+        with open(file_path, "rb") as file:
+            content = file.read()
+
+        # The Group Policy editor writes these files in UTF-16
+        try:
+            if content.startswith((b"\xff\xfe", b"\xfe\xff")):
+                text = content.decode("utf-16")
+            else:
+                text = content.decode("utf-8-sig")
+        except UnicodeError as e:
+            raise ParserError(f"Invalid scripts file encoding: {e}") from e
+
+        sections = {}
+        section = None
+        for count, line in enumerate(text.splitlines()):
+            if count % self.limits.check_interval == 0:
+                deadline.check()
+            line = line.strip()
+
+            if line.startswith('[') and line.endswith(']'):
+                section = line[1:-1].strip()
+                sections.setdefault(section, {})
+            # Comments and lines outside of a section are ignored
+            elif section is not None and '=' in line and not line.startswith(';'):
+                key, value = line.split('=', 1)
+                sections[section][key.strip()] = value.strip()
+
+        return sections
+
+
+def extract_scripts(data: dict, _category: str) -> list:
+    """
+    Extract the scripts of a parsed scripts file.
+
+    Args:
+        data (dict): The sections returned by `ScriptsParser.parse`.
+        _category (str): The category of the file.
+
+    Returns:
+        list: One dictionary per script with its type (the section, such as
+              "Startup" or "Logon"), order, command line and parameters.
+              Sections without scripts, such as [ScriptsConfig], are kept
+              as a single dictionary of their values.
+    """
+    scripts = []
+
+    for section, values in data.items():
+        # order -> "cmdline"/"parameters" -> value
+        entries = {}
+        for key, value in values.items():
+            match = SCRIPT_KEY_PATTERN.fullmatch(key)
+            if match:
+                entries.setdefault(int(match.group(1)), {})[match.group(2).lower()] = value
+
+        if not entries:
+            if values:
+                scripts.append({"type": section, **values})
+            continue
+
+        for order in sorted(entries):
+            script = {"type": section, "order": order, "cmdLine": entries[order].get("cmdline")}
+            if entries[order].get("parameters"):
+                script["parameters"] = entries[order]["parameters"]
+            scripts.append(script)
+
+    return scripts
@@ -0,0 +1,65 @@
+"""Resource limits and errors shared by the parsers."""
+# gpoanalyzer/parse/limits.py
+
+import os
+import time
+
+
+class ParserError(ValueError):
+    """Raised when a file cannot be parsed and must be skipped."""
+
+
+class ParserLimitError(ParserError):
+    """Raised when a file exceeds a parser budget or stops the parser progress."""
+
+
+class Deadline:  # pylint: disable=too-few-public-methods
+    """Time budget of a single file."""
+
+    def __init__(self, max_seconds: float = None) -> None:
+        self.max_seconds = max_seconds
+        self.expires = None if max_seconds is None else time.monotonic() + max_seconds
+
+    def check(self):
+        """Raise `ParserLimitError` if the time budget is exhausted."""
+        if self.expires is not None and time.monotonic() > self.expires:
+            raise ParserLimitError(
+                f"Time budget of {self.max_seconds}s exceeded")
+
+
+class ParseLimits:
+    """Per-file byte and time budgets applied by the parsers.
+
+    A `None` budget means unlimited, which is the default.
+    """
+
+    # Number of parser steps between two deadline checks
+    check_interval = 4096
+
+    def __init__(self, max_bytes: int = None, max_seconds: float = None) -> None:
+        """Initialize the ParseLimits instance.
+
+        Args:
+            max_bytes (int): The maximum size of a single file, in bytes.
+            max_seconds (float): The maximum time spent parsing a single file.
+        """
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+
+    def check_size(self, file_path: str):
+        """Raise `ParserLimitError` if the file exceeds the byte budget."""
+        if self.max_bytes is None:
+            return
+        size = os.path.getsize(file_path)
+        if size > self.max_bytes:
+            raise ParserLimitError(
+                f"File size of {size} bytes exceeds the budget of {self.max_bytes} bytes")
+
+    def start(self, file_path: str) -> Deadline:
+        """Check the byte budget and start the time budget of a file."""
+        self.check_size(file_path)
+        return Deadline(self.max_seconds)
+
+
+# Budgets used when a parser is created without explicit limits
+NO_LIMITS = ParseLimits()
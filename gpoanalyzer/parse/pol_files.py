@@ -1,20 +1,137 @@
 """Parser for POL files."""
 # gpoanalyzer/parse/pol_files.py
 
+import hashlib
 import os
+from array import array
+
+from gpoanalyzer.parse.limits import NO_LIMITS, ParseLimits, ParserError, ParserLimitError
+
+# Registry types, indexed by their type code
+POL_REG_TYPES = ("REG_NONE", "REG_SZ", "REG_EXPAND_SZ", "REG_BINARY",
+                 "REG_DWORD", "REG_DWORD_BIG_ENDIAN", "REG_LINK",
+                 "REG_MULTI_SZ", "REG_RESOURCE_LIST", "REG_FULL_RESOURCE_DESCRIPTOR",
+                 "REG_RESOURCE_REQUIREMENTS_LIST", "REG_QWORD")
+
+# Data larger than this is reported as "(BLOB)" instead of being decoded
+POL_BLOB_SIZE = 1024
+
+# Array type codes by item size, used to byteswap integers in bulk
+ARRAY_TYPECODES = {array(typecode).itemsize: typecode for typecode in "QLI"}
+
+
+def find_aligned(pol_bytes: bytes, pattern: bytes, start: int, offset: int = 0) -> int:
+    """
+    Find the first UTF-16 aligned position followed by a pattern.
+
+    Args:
+        pol_bytes (bytes): The bytes to search.
+        pattern (bytes): The pattern to find.
+        start (int): The position the search starts from.
+        offset (int): The distance between the returned position and the pattern.
+
+    Returns:
+        int: The first position p >= start, an even number of bytes after
+             `start`, such that the pattern occurs at p + offset, or -1.
+    """
+    position = pol_bytes.find(pattern, start + offset)
+    while position != -1 and (position - offset - start) % 2:
+        position = pol_bytes.find(pattern, position + 1)
+    return position - offset if position != -1 else -1
+
+
+def decode_strings(column: list) -> list:
+    """Decode UTF-16LE string data without its trailing null characters."""
+    joined = b"".join(column)
+    if not any(len(data) % 2 for data in column):
+        text = joined.decode("utf-16le")
+        # Without surrogate pairs, each character is two bytes and the rows
+        # are sliced out of a single decoded string
+        if len(text) * 2 == len(joined):
+            values = []
+            start = 0
+            for data in column:
+                end = start + len(data) // 2
+                values.append(text[start:end].rstrip("\x00"))
+                start = end
+            return values
+    return [data.decode("utf-16le").rstrip("\x00") for data in column]
+
+
+def decode_integers(column: list, size: int, byteorder: str) -> list:
+    """Format integer data as hexadecimal strings, most significant byte first."""
+    typecode = ARRAY_TYPECODES.get(size)
+    if typecode is None or any(len(data) != size for data in column):
+        # Data of an unexpected size is formatted row by row
+        return [f"0x{(data[::-1] if byteorder == 'little' else data).hex()}"
+                for data in column]
+
+    integers = array(typecode, b"".join(column))
+    if byteorder == "little":
+        integers.byteswap()
+    digits = integers.tobytes().hex()
+    width = size * 2
+    return ["0x" + digits[start:start + width] for start in range(0, len(digits), width)]
+
+
+def decode_binary(column: list) -> list:
+    """Format binary data as hexadecimal strings."""
+    digits = b"".join(column).hex()
+    values = []
+    start = 0
+    for data in column:
+        end = start + len(data) * 2
+        values.append(digits[start:end])
+        start = end
+    return values
+
+
+# Decoder of the data of each registry type, binary data by default
+DECODERS = {
+    "REG_SZ": decode_strings,
+    "REG_EXPAND_SZ": decode_strings,
+    "REG_LINK": decode_strings,
+    "REG_MULTI_SZ": decode_strings,
+    "REG_DWORD": lambda column: decode_integers(column, 4, "little"),
+    "REG_DWORD_BIG_ENDIAN": lambda column: decode_integers(column, 4, "big"),
+    "REG_QWORD": lambda column: decode_integers(column, 8, "little"),
+}
+
+
+def row_key(row: dict) -> str:
+    """
+    Return the key of a row, derived from its key, value name and data.
+
+    Rows with the same key, value name and data share a key. Unlike `hash`,
+    the digest is the same in every process, so outputs and snapshots of the
+    same files are identical.
+    """
+    # Key and value names never contain null characters, and data comes last
+    text = "\x00".join((row['Key'], row['Value'], row['Data']))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def iter_rows(data: dict, _source: str):
+    """Yield each row with the path of the Registry.pol file it was read from."""
+    for row in data.values():
+        yield row['name'], row
 
 
 class POLParser:
-    """Class to parse Registry.pol files and extract relevant data."""
+    """Class to parse Registry.pol files and extract relevant data.
 
-    def __init__(self) -> None:
-        self.field_index = 0
-        self.pol_str_tmp = ""
-        self.data_size = 0
-        self.current_row = {}
+    Parsing has two stages. The entries of each file are first split into
+    their key, value name, type and raw data. The raw data of all the rows
+    is then decoded in bulk, one column per registry type, so that the cost
+    of decoding does not grow with per-row overhead.
+    """
+
+    def __init__(self, limits: ParseLimits = None) -> None:
         self.results = {}
+        self.skipped = []
         self.pol_file = ""
         self.hive = ""
+        self.limits = limits or NO_LIMITS
 
     def determine_hive(self):
         """Determine the hive type based on the file path."""
@@ -25,132 +142,174 @@ class POLParser:
         return "?"
 
     def normalize(self, data):
-        """Remove entries with null values from data."""
+        """Remove entries of types without meaningful data."""
         return {key: value for key, value in data.items(
-        ) if value["Type"] not in ["REG_NONE", "REG_BINARY"] and '??' not in value["Data"]}
+        ) if value["Type"] not in ["REG_NONE", "REG_BINARY"]}
 
     def parse_pol_file(self):
-        """Parse a single POL file and extract relevant data."""
-        pol_reg_types = ("REG_NONE", "REG_SZ", "REG_EXPAND_SZ", "REG_BINARY",
-                         "REG_DWORD", "REG_DWORD_BIG_ENDIAN", "REG_LINK",
-                         "REG_MULTI_SZ", "REG_RESOURCE_LIST", "REG_FULL_RESOURCE_DESCRIPTOR",
-                         "REG_RESOURCE_REQUIREMENTS_LIST", "REG_QWORD")
-        pol_blob_size = 1024
+        """
+        Split a single POL file into rows, without decoding their data.
+
+        Returns:
+            tuple: The rows and the raw data of each row, None for blobs.
+        """
+        rows = []
+        raw_data = []
 
         if self.pol_file and os.path.exists(self.pol_file):
+            deadline = self.limits.start(self.pol_file)
             with open(self.pol_file, 'rb') as file:
                 pol_bytes = file.read()
 
-                # Determine Hive
-                self.hive = self.determine_hive()
-
-                pol_bytes = pol_bytes[8:]
-
-                index = 0
-                self.current_row = {'name': self.pol_file, 'Hive': self.hive,
-                                    'Key': '??', 'Value': '??', 'Type': '??', 'Data': '??'}
-                self.field_index = 0
-                self.pol_str_tmp = ""
-                self.data_size = 0
-                while index < len(pol_bytes):
-                    if self.field_index == 0:  # key field
-                        index = self.parse_key_field(pol_bytes, index)
-                    elif self.field_index == 1:  # value field
-                        index = self.parse_value_field(pol_bytes, index)
-                    elif self.field_index == 2:  # type field
-                        index = self.parse_type_field(
-                            pol_bytes, index, pol_reg_types)
-                    elif self.field_index == 3:  # size field
-                        index = self.parse_size_field(pol_bytes, index)
-                    elif self.field_index == 4:  # data field
-                        index = self.parse_data_field(
-                            pol_bytes, index, pol_blob_size)
-                    else:
-                        break
-
-        return self.results
-
-    def parse_key_field(self, pol_bytes, index):
-        """Parse the key field in POL file."""
-        if pol_bytes[index:index+4] == b'\x00\x00;\x00':
-            if "[" in self.pol_str_tmp:
-                self.pol_str_tmp = self.pol_str_tmp.replace(
-                    "]", "").replace("[", "")
-            self.current_row['Key'] = self.pol_str_tmp
-            self.pol_str_tmp = ""
-            self.field_index = 1
-            index += 2
-        else:
-            self.pol_str_tmp += pol_bytes[index:index+2].decode('utf-16le')
-            index += 2
-        return index
-
-    def parse_value_field(self, pol_bytes, index):
-        """Parse the value field in POL file."""
-        if pol_bytes[index:index+2] == b'\x00\x00':
-            if "**del." in self.pol_str_tmp[1:]:
-                self.pol_str_tmp = self.pol_str_tmp.replace("**del.", "")
-            self.current_row['Value'] = self.pol_str_tmp[1:]
-            self.pol_str_tmp = ""
-            self.field_index = 2
-            index += 2
-        else:
-            self.pol_str_tmp += pol_bytes[index:index+2].decode('utf-16le')
-            index += 2
-        return index
-
-    def parse_type_field(self, pol_bytes, index, pol_reg_types):
-        """Parse the type field in POL file."""
-        if pol_bytes[index+4:index+6] == b';\x00':
-            type_code = int.from_bytes(pol_bytes[index:index+1], 'little')
-            self.current_row['Type'] = pol_reg_types[type_code]
-            self.field_index = 3
+            # Determine Hive
+            self.hive = self.determine_hive()
+
+            for count, (key, value, reg_type, data) in enumerate(self.read_entries(pol_bytes[8:])):
+                if count % self.limits.check_interval == 0:
+                    deadline.check()
+                rows.append({'name': self.pol_file, 'Hive': self.hive, 'Key': key,
+                             'Value': value, 'Type': reg_type, 'Data': None})
+                raw_data.append(data)
+
+        return rows, raw_data
+
+    @staticmethod
+    def read_entries(pol_bytes: bytes):
+        """
+        Yield the entries of the body of a POL file.
+
+        Each entry is "[key;value;type;size;data]", with UTF-16LE strings.
+
+        Yields:
+            tuple: The key, value name, registry type and raw data of an
+                   entry. The data is None if it is larger than `POL_BLOB_SIZE`.
+
+        Raises:
+            ParserError: If an entry is truncated or its size does not match
+                         its data.
+        """
+        index = 0
+        end_of_file = len(pol_bytes)
+
+        while index < end_of_file:
+            # Key field, terminated by a null character and ';'
+            end = find_aligned(pol_bytes, b'\x00\x00;\x00', index)
+            if end == -1:
+                raise ParserError(f"Truncated entry at offset {index + 8}")
+            key = pol_bytes[index:end].decode('utf-16le')
+            if "[" in key:
+                key = key.replace("]", "").replace("[", "")
+            index = end + 2
+
+            # Value field, starting with ';' and terminated by a null character
+            end = find_aligned(pol_bytes, b'\x00\x00', index)
+            if end == -1:
+                raise ParserError(f"Truncated entry at offset {index + 8}")
+            value = pol_bytes[index:end].decode('utf-16le')
+            if "**del." in value[1:]:
+                value = value.replace("**del.", "")
+            index = end + 2
+
+            # Type field, a 32-bit code followed by ';'
+            end = find_aligned(pol_bytes, b';\x00', index, offset=4)
+            if end == -1:
+                raise ParserError(f"Truncated entry at offset {index + 8}")
+            type_code = pol_bytes[end]
+            if type_code >= len(POL_REG_TYPES):
+                raise ParserError(f"Invalid registry type {type_code} at offset {end + 8}")
+            index = end + 6
+
+            # Size field, a 32-bit size followed by ';'
+            if index + 6 > end_of_file:
+                raise ParserError(f"Truncated entry at offset {index + 8}")
+            if pol_bytes[index+4:index+6] != b';\x00':
+                raise ParserLimitError(f"Parser stopped making progress at offset {index + 8}")
+            data_size = int.from_bytes(pol_bytes[index:index+4], 'little')
+            if data_size > end_of_file - index - 6:
+                raise ParserError(
+                    f"Data size of {data_size} bytes exceeds the file at offset {index + 8}")
             index += 6
-        else:
+
+            # Data field, followed by the ']' closing the entry, so that a
+            # wrong size is reported instead of shifting the next fields
+            data = pol_bytes[index:index+data_size] if data_size <= POL_BLOB_SIZE else None
+            index += data_size
+            if pol_bytes[index:index+2] != b']\x00':
+                raise ParserError(f"Entry not closed after its data at offset {index + 8}")
             index += 2
-        return index
 
-    def parse_size_field(self, pol_bytes, index):
-        """Parse the size field in POL file."""
-        if pol_bytes[index+4:index+6] == b';\x00':
-            self.data_size = int.from_bytes(pol_bytes[index:index+4], 'little')
-            self.field_index = 4
-            index += 6
-        return index
-
-    def parse_data_field(self, pol_bytes, index, pol_blob_size):
-        """Parse the data field in POL file."""
-        data = pol_bytes[index:index+self.data_size]
-        if self.data_size > pol_blob_size:
-            self.current_row['Data'] = "(BLOB)"
-        else:
-            if self.current_row['Type'] in ["REG_MULTI_SZ", "REG_SZ", "REG_EXPAND_SZ"]:
-                while data[-2:] == b'\x00\x00':
-                    data = data[:-2]
-                self.current_row['Data'] = data.decode('utf-16le')
-            if self.current_row['Type'] == "REG_DWORD":
-                self.current_row['Data'] = f"0x{data[::-1].hex()}"
-
-        index += self.data_size
-        hashable_data = tuple(
-            [self.current_row["Key"], self.current_row["Value"], self.current_row["Data"]])
-        element_hash = hash(hashable_data)
-        self.results[element_hash] = self.current_row
-        self.current_row = {'name': self.pol_file, 'Hive': self.hive, 'Key': '??',
-                            'Value': '??', 'Type': '??', 'Data': '??'}
-        self.field_index = 0
-        return index
+            yield key, value[1:], POL_REG_TYPES[type_code], data
+
+    @staticmethod
+    def decode_rows(rows: list, raw_data: list) -> dict:
+        """
+        Decode the raw data of all rows, one registry type at a time.
+
+        Args:
+            rows (list): The rows, whose 'Data' is set to the decoded data.
+            raw_data (list): The raw data of each row, None for blobs.
+
+        Returns:
+            dict: The files holding invalid string data, with the reason.
+        """
+        # registry type -> positions of its rows
+        columns = {}
+        for position, (row, data) in enumerate(zip(rows, raw_data)):
+            if data is None:
+                row['Data'] = "(BLOB)"
+            else:
+                columns.setdefault(row['Type'], []).append(position)
+
+        invalid = {}
+        for reg_type, positions in columns.items():
+            decode = DECODERS.get(reg_type, decode_binary)
+            column = [raw_data[position] for position in positions]
+            try:
+                values = decode(column)
+            except UnicodeDecodeError:
+                # Decode row by row to find the files holding invalid strings
+                values = []
+                for position, data in zip(positions, column):
+                    try:
+                        values.extend(decode([data]))
+                    except UnicodeDecodeError as e:
+                        invalid.setdefault(rows[position]['name'], str(e))
+                        values.append(None)
+
+            for position, value in zip(positions, values):
+                rows[position]['Data'] = value
+
+        return invalid
 
     def parse(self, file_paths: str) -> dict:
-        """Parse Registry POL files and extract relevant data."""
+        """Parse Registry POL files and extract relevant data.
+
+        Files that cannot be read or parsed within the limits are skipped
+        and recorded in `self.skipped` as (file path, reason) tuples.
+        """
+        rows = []
+        raw_data = []
+        for pol_file in file_paths:
+            self.pol_file = pol_file
+            try:
+                file_rows, file_data = self.parse_pol_file()
+            except UnicodeDecodeError as e:
+                self.skipped.append((pol_file, f"Invalid string data: {e}"))
+                continue
+            except (OSError, ParserError) as e:
+                self.skipped.append((pol_file, str(e)))
+                continue
+            rows.extend(file_rows)
+            raw_data.extend(file_data)
+
+        invalid = self.decode_rows(rows, raw_data)
+        for pol_file, reason in invalid.items():
+            self.skipped.append((pol_file, f"Invalid string data: {reason}"))
+
         self.results = {}
-        try:
-            for pol_file in file_paths:
-                self.pol_file = pol_file
-                file_results = self.parse_pol_file()
-                self.results.update(file_results)
-            final_results = self.normalize(self.results)
-        except OSError as e:
-            print("Exception: an error occurred in POLParser:", e)
-
-        return final_results
+        for row in rows:
+            if row['name'] in invalid:
+                continue
+            self.results[row_key(row)] = row
+
+        return self.normalize(self.results)
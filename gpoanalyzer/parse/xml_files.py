@@ -3,42 +3,127 @@
 
 import xml.etree.ElementTree as ET
 
+from gpoanalyzer.parse import XML_BACKENDS
+from gpoanalyzer.parse.limits import NO_LIMITS, Deadline, ParseLimits, ParserError
 
-class XMLParser:
-    """Class to parse XML files and extract relevant data."""
-
-    def __init__(self) -> None:
-        pass
-
-    def to_dict(self, element):
-        """Convert an XML element into a dictionary."""
-        # Initialize the dictionary with the attributes of the element
-        node = dict(element.attrib)
-
-        # If the element has sub-elements, handle them recursively
-        if element:
-            # Handle cases where there are multiple sub-elements with the same tag
-            children = {}
-            for child in element:
-                child_dict = self.to_dict(child)
-                if child.tag in children:
-                    # If the tag is already present and not a list, convert it to a list
-                    if not isinstance(children[child.tag], list):
-                        children[child.tag] = [children[child.tag]]
-                    children[child.tag].append(child_dict)
-                else:
-                    children[child.tag] = child_dict
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+# Exceptions raised by the backends on malformed documents
+SYNTAX_ERRORS = (ET.ParseError,) + (
+    (lxml_etree.XMLSyntaxError,) if lxml_etree is not None  # pylint: disable=c-extension-no-member
+    else ())
+
+# First lxml version accepting resolve_entities="internal"
+LXML_MIN_VERSION = (5,)
+
+# Number of bytes fed to the XML parser at once
+CHUNK_SIZE = 1 << 16
+
+
+class DictBuilder:
+    """Parser target converting an XML document into dictionaries without a tree.
+
+    Each element becomes a dictionary of its attributes and sub-elements,
+    with sub-elements sharing a tag grouped in a list and the text of leaf
+    elements kept as '_text'. The XML parser calls `start`, `data` and `end`
+    for every element, so the dictionaries are built in a single pass and no
+    element objects are kept.
+    """
+
+    def __init__(self, deadline: Deadline = None, check_interval: int = 4096) -> None:
+        # One (node, children, text chunks) entry per open element
+        self.stack = [({}, {}, [])]
+        self.deadline = deadline
+        self.check_interval = check_interval
+        self.count = 0
+
+    def start(self, _tag, attrib):
+        """Open an element, initialized with its attributes."""
+        self.count += 1
+        if self.deadline is not None and self.count % self.check_interval == 0:
+            self.deadline.check()
+        self.stack.append((dict(attrib), {}, []))
+
+    def data(self, data):
+        """Collect the text of the current element."""
+        self.stack[-1][2].append(data)
+
+    def end(self, tag):
+        """Close an element and add it to the children of its parent."""
+        node, children, text = self.stack.pop()
+
+        if children:
             node.update(children)
-        # If the element has text, add that as a '_text' value
-        elif element.text:
-            text = element.text.strip()
+        elif text:
+            # Text is only kept for elements without sub-elements
+            text = "".join(text).strip()
             if text:
                 node['_text'] = text
 
-        return node
+        # Multiple sub-elements with the same tag are grouped in a list
+        parent = self.stack[-1][1]
+        if tag in parent:
+            if not isinstance(parent[tag], list):
+                parent[tag] = [parent[tag]]
+            parent[tag].append(node)
+        else:
+            parent[tag] = node
+
+    def close(self):
+        """Return the dictionary of the root element, None if incomplete."""
+        root = self.stack[0][1]
+        if len(self.stack) != 1 or len(root) != 1:
+            return None
+        return next(iter(root.values()))
+
+
+class XMLParser:
+    """Class to parse XML files and extract relevant data.
+
+    The document is parsed with the standard library `xml.etree.ElementTree`
+    by default, or with lxml when it is selected. Both backends produce the
+    same output. Feeding a Python target costs more on lxml than on expat,
+    so the standard library is the faster of the two.
+    """
+
+    def __init__(self, limits: ParseLimits = None, backend: str = "auto") -> None:
+        if backend not in XML_BACKENDS:
+            raise ValueError(f"Invalid XML backend: {backend}")
+        if backend == "auto":
+            backend = "stdlib"
+        if backend == "lxml" and (lxml_etree is None
+                                  or lxml_etree.LXML_VERSION < LXML_MIN_VERSION):
+            raise ValueError("The lxml XML backend requires lxml 5 or later")
+
+        self.limits = limits or NO_LIMITS
+        self.backend = backend
+
+    def make_parser(self, target: DictBuilder):
+        """Create a parser of the selected backend feeding the given target."""
+        if self.backend == "lxml":
+            # Only internal entities are resolved, like with expat: external
+            # ones are rejected whatever the default of the lxml version
+            return lxml_etree.XMLParser(  # pylint: disable=c-extension-no-member
+                target=target, remove_comments=True, remove_pis=True, no_network=True,
+                resolve_entities="internal")
+        return ET.XMLParser(target=target)
 
     def parse(self, file_path: str):
         """Read an XML file and convert it into a Python object."""
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        return self.to_dict(root)
+        deadline = self.limits.start(file_path)
+        parser = self.make_parser(DictBuilder(deadline, self.limits.check_interval))
+
+        try:
+            with open(file_path, "rb") as file:
+                for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                    parser.feed(chunk)
+            result = parser.close()
+        except SYNTAX_ERRORS as e:
+            raise ParserError(f"Malformed XML: {e}") from e
+
+        if result is None:
+            raise ParserError("Malformed XML: no complete root element")
+        return result
@@ -0,0 +1,269 @@
+"""Parser plugins for GPOAnalyzer."""
+# gpoanalyzer/plugins.py
+
+import importlib
+import re
+from importlib.metadata import entry_points
+from typing import NamedTuple
+
+from gpoanalyzer.common import extract_data
+from gpoanalyzer.gpo_value_paths import gpo_value_paths
+
+# Entry point group of the parser plugins of installed packages
+ENTRY_POINT_GROUP = "gpoanalyzer.parsers"
+
+# Plugin names are used as result keys and command line flags
+NAME_PATTERN = re.compile(r"[a-z][a-z0-9_]*")
+
+
+def load_reference(reference: str):
+    """Import and return the object of a "module:attribute" reference."""
+    module_name, _, attribute = reference.partition(":")
+    value = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        value = getattr(value, name)
+    return value
+
+
+def extract_values(data: dict, category: str) -> list:
+    """Extract the values configured in `gpo_value_paths` from a parsed XML file."""
+    extracted_data = extract_data(data, gpo_value_paths.get(category))
+    # Values of the file excluding the 'clsid' key
+    return [values for key, values in extracted_data.items() if key != "clsid"]
+
+
+def iter_extracted(data: list, source: str):
+    """Yield the (source, entry) pairs of the values extracted from an XML file.
+
+    Single elements are dictionaries, repeated elements are lists of dictionaries.
+    """
+    for item in data:
+        for entry in item if isinstance(item, list) else [item]:
+            if isinstance(entry, dict):
+                yield source, entry
+
+
+def iter_whole(data, source: str):
+    """Yield the result of a file as a single (source, entry) pair."""
+    yield source, data
+
+
+def merge_results(file_results: list) -> dict:
+    """Merge the results of several files of an aggregated plugin."""
+    merged = {}
+    for data in file_results:
+        if data:
+            merged.update(data)
+    return merged
+
+
+class ParserPlugin(NamedTuple):
+    """A supported file type.
+
+    The parser, extract, merge and entries functions are declared as
+    "module:attribute" references and only imported when the plugin is used,
+    so that declaring a plugin does not import its parser.
+
+    Attributes:
+        name (str): The category of the files, used as the key of the results
+                    and as the command line flag.
+        filenames (tuple): The lower case names of the files of the category.
+        description (str): The help of the command line flag.
+        parser (str): A parser class, or factory, called with `limits` and the
+                      `options` of the plugin. Its `parse` method takes a file
+                      path, or the list of all file paths if `aggregate` is set,
+                      and the files it skips are recorded in `skipped`.
+        extract (str): An optional function called with the parsed data of a
+                       file and the category, returning the result of the file.
+        aggregate (bool): True if the files are parsed into a single result
+                          instead of one result per file.
+        merge (str): An optional function combining per-file results of an
+                     aggregated plugin, `merge_results` by default.
+        options (tuple): The names of the `GPOAnalyzer` parser options passed
+                         to the parser, such as "backend".
+        entries (str): An optional function called with the result of a file
+                       and its path, yielding the (source, entry) pairs the
+                       findings rules are evaluated on, `iter_extracted` by default.
+        fields (tuple): The top-level fields of the entries findings rules can
+                        match, or None if they are not checked.
+        annotate (bool): True if the results are Registry.pol rows, annotated
+                         with policy names when an ADMX index is loaded.
+    """
+    name: str
+    filenames: tuple
+    description: str
+    parser: str
+    extract: str = None
+    aggregate: bool = False
+    merge: str = None
+    options: tuple = ()
+    entries: str = None
+    fields: tuple = None
+    annotate: bool = False
+
+    def create_parser(self, limits=None, options: dict = None):
+        """Import the parser and create an instance with the given limits and options."""
+        factory = load_reference(self.parser)
+        kwargs = {key: value for key, value in (options or {}).items() if key in self.options}
+        return factory(limits=limits, **kwargs)
+
+    def extract_file(self, data):
+        """Return the result of a file from its parsed data."""
+        if self.extract is None:
+            return data
+        return load_reference(self.extract)(data, self.name)
+
+    def merge_files(self, file_results: list):
+        """Combine the per-file results of an aggregated plugin."""
+        merge = load_reference(self.merge) if self.merge else merge_results
+        return merge(file_results)
+
+    def iter_entries(self, data, source: str = None):
+        """Yield the (source, entry) pairs of the result of a file."""
+        iterate = load_reference(self.entries) if self.entries else iter_extracted
+        return iterate(data, source)
+
+
+def xml_plugin(name: str, filename: str, description: str) -> ParserPlugin:
+    """Declare a Group Policy Preferences XML file extracted with `gpo_value_paths`."""
+    return ParserPlugin(name, (filename,), description,
+                        parser="gpoanalyzer.parse.xml_files:XMLParser",
+                        extract="gpoanalyzer.plugins:extract_values",
+                        options=("backend",), fields=tuple(gpo_value_paths[name]))
+
+
+BUILTIN_PLUGINS = (
+    xml_plugin("shortcuts", "shortcuts.xml",
+               "Extract shortcut configurations from Shortcuts XML files"),
+    xml_plugin("scheduledtasks", "scheduledtasks.xml",
+               "Extract scheduled tasks from ScheduledTasks XML files"),
+    xml_plugin("drives", "drives.xml",
+               "Extract network drive mappings from Drives XML files"),
+    xml_plugin("groups", "groups.xml",
+               "Extract group membership settings from Groups XML files"),
+    xml_plugin("printers", "printers.xml",
+               "Extract printer configurations from Printers.xml"),
+    xml_plugin("registryxml", "registry.xml",
+               "Extract settings from Registry.xml"),
+    xml_plugin("envvars", "environmentvariables.xml",
+               "Extract env variable settings from EnvironmentVariables.xml"),
+    xml_plugin("files", "files.xml",
+               "Extract file policies from Files.xml"),
+    xml_plugin("services", "services.xml",
+               "Extract service configurations from Services.xml"),
+    xml_plugin("folders", "folders.xml",
+               "Extract folder settings from Folders.xml"),
+    xml_plugin("internetsettings", "internetsettings.xml",
+               "Extract internet settings from InternetSettings XML files"),
+    xml_plugin("networkshares", "networkshares.xml",
+               "Extract network share settings from NetworkShares.xml"),
+    ParserPlugin("registrypol", ("registry.pol",),
+                 "Extract registry settings from Registry.pol",
+                 parser="gpoanalyzer.parse.pol_files:POLParser", aggregate=True,
+                 entries="gpoanalyzer.parse.pol_files:iter_rows", annotate=True),
+    ParserPlugin("gpttmpl", ("gpttmpl.inf",),
+                 "Extract group policy template data from GptTmpl.inf files",
+                 parser="gpoanalyzer.parse.inf_files:INFParser", aggregate=True,
+                 merge="gpoanalyzer.parse.inf_files:merge_sections",
+                 entries="gpoanalyzer.plugins:iter_whole"),
+    ParserPlugin("scripts", ("scripts.ini", "psscripts.ini"),
+                 "Extract startup, shutdown, logon and logoff scripts from Scripts.ini "
+                 "and psscripts.ini",
+                 parser="gpoanalyzer.parse.ini_files:ScriptsParser",
+                 extract="gpoanalyzer.parse.ini_files:extract_scripts"),
+)
+
+
+def iter_entry_points(group: str):
+    """Return the entry points of an entry point group."""
+    installed = entry_points()
+    # The selection API replaced the dictionary interface in Python 3.10
+    if hasattr(installed, "select"):
+        return installed.select(group=group)
+    return installed.get(group, [])
+
+
+class ParserRegistry:
+    """Registry of the parser plugins, by name.
+
+    Plugins of installed packages are declared as entry points of the
+    `gpoanalyzer.parsers` group, each loading a `ParserPlugin`. They are
+    loaded the first time the registry is used, after the built-in plugins,
+    and a plugin that fails to load is recorded in `errors` and skipped.
+    """
+
+    def __init__(self, plugins=(), group: str = ENTRY_POINT_GROUP) -> None:
+        """Initialize the ParserRegistry instance.
+
+        Args:
+            plugins (tuple): The plugins registered first.
+            group (str): The entry point group plugins are loaded from, or
+                         None to only use the given plugins.
+        """
+        self.group = group
+        # name -> ParserPlugin, in registration order
+        self.plugins = {}
+        # (entry point name, reason) of the plugins that failed to load
+        self.errors = []
+        # Names used for something else, such as command line options
+        self.reserved = set()
+        for plugin in plugins:
+            self.register(plugin)
+
+    def register(self, plugin: ParserPlugin):
+        """Add a plugin to the registry."""
+        if not isinstance(plugin, ParserPlugin):
+            raise TypeError(f"Not a parser plugin: {plugin!r}")
+        if not NAME_PATTERN.fullmatch(plugin.name):
+            raise ValueError(f"Invalid parser plugin name: {plugin.name}")
+        if plugin.name in self.reserved:
+            raise ValueError(f"Reserved parser plugin name: {plugin.name}")
+        if plugin.name in self.plugins:
+            raise ValueError(f"Duplicate parser plugin: {plugin.name}")
+        self.plugins[plugin.name] = plugin
+
+    def reserve(self, names):
+        """Reserve names used for something else, dropping the plugins using them."""
+        self.reserved.update(names)
+        for name in [name for name in self.plugins if name in self.reserved]:
+            del self.plugins[name]
+            self.errors.append((name, f"Reserved parser plugin name: {name}"))
+
+    def load_entry_points(self):
+        """Register the plugins of installed packages, once."""
+        if self.group is None:
+            return
+        group, self.group = self.group, None
+
+        for entry_point in sorted(iter_entry_points(group), key=lambda point: point.name):
+            try:
+                self.register(entry_point.load())
+            except Exception as e:  # pylint: disable=broad-except
+                # Importing a third-party module can raise anything
+                self.errors.append((entry_point.name, str(e)))
+
+    def get(self, name: str) -> ParserPlugin:
+        """Return the plugin of a category, or None."""
+        self.load_entry_points()
+        return self.plugins.get(name)
+
+    def names(self) -> list:
+        """Return the names of all plugins."""
+        self.load_entry_points()
+        return list(self.plugins)
+
+    def filenames(self) -> dict:
+        """Return a dictionary mapping each category to its filenames."""
+        self.load_entry_points()
+        return {name: plugin.filenames for name, plugin in self.plugins.items()}
+
+    def __iter__(self):
+        self.load_entry_points()
+        return iter(list(self.plugins.values()))
+
+    def __contains__(self, name) -> bool:
+        return self.get(name) is not None
+
+
+# Plugins used by default: the built-in ones and those of installed packages
+PLUGINS = ParserRegistry(BUILTIN_PLUGINS)
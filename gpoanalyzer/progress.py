@@ -0,0 +1,120 @@
+"""Progress reporting for GPOAnalyzer."""
+# gpoanalyzer/progress.py
+
+import os
+import shutil
+import sys
+import time
+
+# Minimum number of seconds between two redraws of the progress line
+REFRESH_INTERVAL = 0.1
+
+
+def format_bytes(size: float) -> str:
+    """Format a number of bytes with a binary unit."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def format_duration(seconds: float) -> str:
+    """Format a number of seconds as H:MM:SS."""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
+
+
+def file_size(file_path: str) -> int:
+    """Return the size of a file, 0 if it cannot be read."""
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+class ParseProgress:
+    """Single-line progress display of a parse, drawn on standard error.
+
+    `GPOAnalyzer` reports the files it discovers and parses, and the line is
+    redrawn at most every `REFRESH_INTERVAL` seconds. The ETA is estimated
+    from the bytes of the discovered files that remain to be parsed.
+    """
+
+    def __init__(self, stream=None) -> None:
+        """Initialize the ParseProgress instance.
+
+        Args:
+            stream (file): The terminal the progress is drawn on, standard
+                           error by default.
+        """
+        self.stream = stream or sys.stderr
+        # arg -> [files discovered, files parsed]
+        self.files = {}
+        # Sizes of the discovered files that are not parsed yet
+        self.sizes = {}
+        self.total_bytes = 0
+        self.parsed_bytes = 0
+        self.started = None
+        # Time of the last redraw, 0 while the line is not displayed
+        self.last_draw = 0.0
+
+    @staticmethod
+    def enabled(stream=None) -> bool:
+        """Return True if progress can be drawn, i.e. the stream is a terminal."""
+        stream = stream or sys.stderr
+        try:
+            return stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def discovered(self, arg: str, file_paths: list):
+        """Count the files discovered for an argument."""
+        if self.started is None:
+            self.started = time.monotonic()
+        self.files.setdefault(arg, [0, 0])[0] += len(file_paths)
+        for file_path in file_paths:
+            self.sizes[file_path] = file_size(file_path)
+            self.total_bytes += self.sizes[file_path]
+        self.draw()
+
+    def parsed(self, arg: str, file_paths: list):
+        """Count the files parsed for an argument."""
+        self.files.setdefault(arg, [0, 0])[1] += len(file_paths)
+        self.parsed_bytes += sum(self.sizes.pop(file_path, 0) for file_path in file_paths)
+        self.draw()
+
+    def status(self) -> str:
+        """Return the progress line."""
+        discovered = sum(counts[0] for counts in self.files.values())
+        parsed = sum(counts[1] for counts in self.files.values())
+        categories = " ".join(
+            f"{arg} {counts[1]}/{counts[0]}" for arg, counts in self.files.items())
+
+        elapsed = time.monotonic() - self.started if self.started is not None else 0.0
+        rate = self.parsed_bytes / elapsed if elapsed > 0 else 0.0
+        remaining = self.total_bytes - self.parsed_bytes
+        eta = format_duration(remaining / rate) if rate > 0 else "-"
+
+        return (f"Files {parsed}/{discovered} | {categories} | "
+                f"{format_bytes(rate)}/s | ETA {eta}")
+
+    def draw(self):
+        """Redraw the progress line, unless it was drawn too recently."""
+        now = time.monotonic()
+        if now - self.last_draw < REFRESH_INTERVAL:
+            return
+        self.last_draw = now
+
+        # Truncated to the terminal width, as a wrapped line cannot be redrawn
+        width = shutil.get_terminal_size().columns - 1
+        self.stream.write("\r\x1b[K" + self.status()[:width])
+        self.stream.flush()
+
+    def clear(self):
+        """Erase the progress line before other output is printed."""
+        if self.last_draw:
+            self.stream.write("\r\x1b[K")
+            self.stream.flush()
+            self.last_draw = 0.0
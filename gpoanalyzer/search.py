@@ -0,0 +1,181 @@
+"""Multi-pattern search helpers for GPOAnalyzer."""
+# gpoanalyzer/search.py
+
+import re
+from collections import deque
+from typing import NamedTuple
+
+REGEX_PREFIX = "re:"
+
+# Flags of a pattern without global inline flags
+DEFAULT_FLAGS = re.compile("").flags
+
+# Global inline flag groups such as "(?s)" or "(?u)". Some of them, like
+# "(?u)", leave the flags of a str pattern unchanged, and a match inside an
+# escaped parenthesis only keeps a pattern out of the prefilter.
+GLOBAL_FLAGS_PATTERN = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+class Match(NamedTuple):
+    """A single search match within the parsed data."""
+
+    path: tuple
+    value: str
+    term: str = None
+
+    def format_path(self, separator: str = " > ") -> str:
+        """Return the match position as a compact, human readable string."""
+        return separator.join(str(part) for part in self.path)
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton matching many literal terms in a single scan."""
+
+    def __init__(self, terms) -> None:
+        """Build the automaton for the given literal terms.
+
+        Args:
+            terms (iterable): The literal terms to match. Matching is case
+                              insensitive, terms are reported as given.
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for term in terms:
+            if term:
+                self.add(term)
+        self.build()
+
+    def add(self, term: str):
+        """Add a literal term to the trie."""
+        state = 0
+        for char in term.lower():
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        if term not in self.output[state]:
+            self.output[state].append(term)
+
+    def build(self):
+        """Compute the failure links with a breadth-first walk of the trie."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = (
+                    self.output[next_state] + self.output[self.fail[next_state]])
+
+    def search(self, text: str) -> set:
+        """Return the set of terms found in the given text."""
+        found = set()
+        state = 0
+        goto, fail, output = self.goto, self.fail, self.output
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+def is_combinable(pattern: str) -> bool:
+    """Check whether a regex keeps its meaning inside an alternation of patterns.
+
+    Group numbers, group names and backreferences depend on the other
+    patterns of the alternation, and global inline flags such as `(?s)`
+    are only allowed at the start of the whole expression.
+    """
+    compiled = re.compile(pattern)
+    return (compiled.groups == 0 and compiled.flags == DEFAULT_FLAGS
+            and not GLOBAL_FLAGS_PATTERN.search(pattern))
+
+
+class MultiPatternMatcher:
+    """Combine literal and regex terms into a single matcher.
+
+    Literal terms are matched with an `AhoCorasick` automaton. Regex terms are
+    joined into one alternation used as a prefilter, so a string that matches
+    none of them is rejected in a single `re` call. Patterns that cannot be
+    joined without changing their meaning, because they use groups or global
+    inline flags, are searched on their own.
+    """
+
+    def __init__(self, literals=None, patterns=None) -> None:
+        """Initialize the matcher.
+
+        Args:
+            literals (list): Literal terms to match as substrings.
+            patterns (list): Regex patterns to search for.
+        """
+        self.literals = list(dict.fromkeys(literals or []))
+        self.patterns = list(dict.fromkeys(patterns or []))
+        self.automaton = AhoCorasick(self.literals) if self.literals else None
+        self.regexes = [(pattern, re.compile(pattern, re.IGNORECASE))
+                        for pattern in self.patterns]
+        self.prefiltered = {pattern for pattern in self.patterns if is_combinable(pattern)}
+        self.combined = None
+        if self.prefiltered:
+            self.combined = re.compile(
+                "|".join(f"(?:{pattern})" for pattern in self.patterns
+                         if pattern in self.prefiltered), re.IGNORECASE)
+
+    @property
+    def terms(self) -> list:
+        """All terms known by the matcher, in load order."""
+        return self.literals + [REGEX_PREFIX + pattern for pattern in self.patterns]
+
+    def match(self, text: str) -> list:
+        """Return the terms matching the given text, in load order."""
+        matched = []
+        if self.automaton:
+            found = self.automaton.search(text)
+            if found:
+                matched.extend(term for term in self.literals if term in found)
+        if self.regexes:
+            candidate = self.combined is not None and self.combined.search(text) is not None
+            if candidate or len(self.prefiltered) < len(self.regexes):
+                matched.extend(REGEX_PREFIX + pattern for pattern, regex in self.regexes
+                               if (candidate or pattern not in self.prefiltered)
+                               and regex.search(text))
+        return matched
+
+
+def load_patterns(file_path: str) -> MultiPatternMatcher:
+    """Load search terms from a file and build a `MultiPatternMatcher`.
+
+    Each non-empty line is a term. Lines starting with `re:` are regex
+    patterns, every other line is matched literally. Lines starting with
+    `#` are comments.
+
+    Args:
+        file_path (str): The path to the patterns file.
+
+    Returns:
+        MultiPatternMatcher: The matcher for the loaded terms.
+    """
+    literals = []
+    patterns = []
+
+    with open(file_path, "r", encoding="utf-8") as file:
+        for line in file:
+            term = line.strip()
+            if not term or term.startswith("#"):
+                continue
+            if term.startswith(REGEX_PREFIX):
+                patterns.append(term[len(REGEX_PREFIX):])
+            else:
+                literals.append(term)
+
+    return MultiPatternMatcher(literals=literals, patterns=patterns)
@@ -0,0 +1,181 @@
+"""Local query server for GPOAnalyzer."""
+# gpoanalyzer/server.py
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer, iter_strings
+from gpoanalyzer.gpo_index import GUID_PATTERN, GPOIndex, normalize_guid
+
+
+class QueryState:  # pylint: disable=too-few-public-methods
+    """Parsed results and search index of a single load of the GPO directory."""
+
+    def __init__(self, results: dict, index: GPOIndex = None, file_results: dict = None) -> None:
+        """Build the search index for the given results.
+
+        Args:
+            results (dict): The results returned by `GPOAnalyzer.parse`.
+            index (GPOIndex): The index the results were discovered with.
+            file_results (dict): The results of each file of the aggregated
+                                 categories, by category and file path.
+        """
+        self.results = results
+        self.index = index
+        self.loaded_at = time.time()
+        # Every string of the results with its position, so searches never
+        # walk the nested results again
+        self.strings = list(iter_strings(results))
+        # GPO GUID -> category -> file path -> data
+        self.gpos = {}
+        file_results = file_results or {}
+
+        for category, entries in results.items():
+            # Aggregated results are merged across files, so they are
+            # attributed from the results of each file instead
+            for file_path, data in file_results.get(category, entries).items():
+                guid = self.guid_of(str(file_path))
+                if guid and data:
+                    self.gpos.setdefault(guid, {}).setdefault(category, {})[file_path] = data
+
+        # Responses of the endpoints listing what was loaded
+        gpos = index.gpos.values() if index is not None else ()
+        self.listings = {
+            "categories": {category: len(entries) for category, entries in results.items()},
+            "gpos": {gpo.guid: gpo.to_dict() for gpo in gpos},
+        }
+
+    def guid_of(self, source: str) -> str:
+        """Return the GUID of the GPO a file belongs to, or None."""
+        gpo = self.index.gpo_of(source) if self.index is not None else None
+        if gpo is not None:
+            return gpo.guid
+        guid = GUID_PATTERN.search(source)
+        return normalize_guid(guid.group(0)) if guid else None
+
+    def find(self, search_term: str, max_results: int = None) -> list:
+        """Search the indexed strings for a string or regex pattern."""
+        search_pattern = re.compile(search_term, re.IGNORECASE)
+        matches = []
+        for path, value in self.strings:
+            if max_results is not None and len(matches) >= max_results:
+                break
+            if search_pattern.search(value):
+                matches.append({"path": list(path), "value": value})
+        return matches
+
+
+class GPOQueryServer:
+    """Parse the GPO directory once and answer queries over HTTP/JSON.
+
+    Queries read the current `QueryState`, which is replaced as a whole on
+    reload, so concurrent requests never observe partially loaded results.
+
+    Endpoints:
+        - GET /categories: The loaded categories with their entry counts.
+        - GET /category/<name>: The results of a single category.
+        - GET /find?q=<pattern>[&max=<n>]: Search all loaded strings.
+        - GET /gpos: The indexed GPOs with their display names and versions.
+        - GET /gpo/<guid>: Everything the given GPO configures.
+        - POST /reload: Parse the GPO directory again.
+    """
+
+    def __init__(self, analyzer: GPOAnalyzer, user_args) -> None:
+        """Initialize the GPOQueryServer instance.
+
+        Args:
+            analyzer (GPOAnalyzer): The analyzer used to parse the GPO files.
+            user_args (list): The arguments indicating which files to load.
+        """
+        self.analyzer = analyzer
+        self.user_args = list(user_args)
+        self.reload_lock = threading.Lock()
+        self.state = None
+        self.reload()
+
+    def reload(self) -> QueryState:
+        """Parse the GPO directory and atomically swap in the new results."""
+        with self.reload_lock:
+            # Keep the results of each file to attribute aggregated results to GPOs
+            self.analyzer.file_results = {}
+            results = self.analyzer.parse(self.user_args)
+            self.state = QueryState(results, self.analyzer.index, self.analyzer.file_results)
+        return self.state
+
+    def handle(self, method: str, url: str):
+        """Answer a single query.
+
+        Returns:
+            tuple: The HTTP status code and the JSON serializable response body.
+        """
+        parsed_url = urlparse(url)
+        parts = [unquote(part) for part in parsed_url.path.split("/") if part]
+        state = self.state
+
+        if method == "POST" and parts == ["reload"]:
+            started = time.monotonic()
+            state = self.reload()
+            return 200, {"categories": list(state.results),
+                         "elapsed": round(time.monotonic() - started, 3)}
+
+        if method == "GET" and len(parts) == 1 and parts[0] in state.listings:
+            return 200, state.listings[parts[0]]
+
+        if method == "GET" and parts == ["find"]:
+            return self.handle_find(state, parse_qs(parsed_url.query))
+
+        if method == "GET" and len(parts) == 2 and parts[0] in ("category", "gpo"):
+            lookup = state.results if parts[0] == "category" else state.gpos
+            key = parts[1] if parts[0] == "category" else normalize_guid(parts[1])
+            if key not in lookup:
+                return 404, {"error": f"No data found for {parts[0]} '{parts[1]}'"}
+            return 200, lookup[key]
+
+        return 404, {"error": "Unknown endpoint"}
+
+    @staticmethod
+    def handle_find(state: QueryState, query: dict):
+        """Answer a find query."""
+        search_term = query.get("q", [None])[0]
+        if not search_term:
+            return 400, {"error": "Missing 'q' parameter"}
+        try:
+            max_results = int(query["max"][0]) if "max" in query else None
+            return 200, state.find(search_term, max_results=max_results)
+        except (re.error, ValueError) as e:
+            return 400, {"error": str(e)}
+
+    def serve_forever(self, host: str = "127.0.0.1", port: int = 8765):
+        """Serve queries until interrupted."""
+        query_server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            """Translate HTTP requests into `GPOQueryServer.handle` calls."""
+
+            def respond(self, method):
+                """Send the JSON response for the current request."""
+                status, body = query_server.handle(method, self.path)
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Handle GET requests."""
+                self.respond("GET")
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                """Handle POST requests."""
+                self.respond("POST")
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                """Silence the default per-request logging."""
+
+        with ThreadingHTTPServer((host, port), RequestHandler) as httpd:
+            httpd.serve_forever()
@@ -0,0 +1,137 @@
+"""Result snapshots for GPOAnalyzer."""
+# gpoanalyzer/snapshot.py
+
+import json
+import struct
+import time
+import zlib
+
+from gpoanalyzer.gpo_index import GPOIndex
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer, merge_file_results
+from gpoanalyzer.plugins import PLUGINS
+
+MAGIC = b"GPOASNAP"
+SNAPSHOT_VERSION = 2
+
+# Magic, format version and length of the uncompressed payload
+HEADER = struct.Struct("<8sHQ")
+
+# Deflate never expands data more than about 1032 times, so a larger
+# uncompressed length in the header cannot be genuine
+MAX_RATIO = 1032
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a snapshot this version can read."""
+
+
+class Snapshot:
+    """Parsed results and discovery index of a GPO directory, saved to a file.
+
+    A snapshot file is a fixed header followed by the zlib compressed JSON
+    payload. JSON keeps loading safe for snapshots received from others;
+    the header allows rejecting foreign files and incompatible versions
+    before decompressing anything, and bounds the decompressed size.
+    Aggregated categories are saved file by file and merged again on load,
+    so their results keep their source file.
+    """
+
+    def __init__(self, results: dict, index: GPOIndex, created: float = None,
+                 file_results: dict = None) -> None:
+        """Initialize the Snapshot instance.
+
+        Args:
+            results (dict): The results returned by `GPOAnalyzer.parse`.
+            index (GPOIndex): The index the results were discovered with.
+            created (float): The creation time, now by default.
+            file_results (dict): The results of each file of the aggregated
+                                 categories, by category and file path.
+        """
+        self.results = results
+        self.index = index
+        self.created = time.time() if created is None else created
+        self.file_results = file_results or {}
+
+    @classmethod
+    def capture(cls, analyzer: GPOAnalyzer, user_args):
+        """Parse the given arguments and capture the results in a snapshot."""
+        if analyzer.file_results is None:
+            analyzer.file_results = {}
+        results = analyzer.parse(user_args)
+        file_results = {arg: files for arg, files in analyzer.file_results.items()
+                        if arg in results}
+        return cls(results, analyzer.index, file_results=file_results)
+
+    def save(self, file_path: str) -> int:
+        """
+        Write the snapshot to a file.
+
+        Args:
+            file_path (str): The path of the snapshot file.
+
+        Returns:
+            int: The size of the written file, in bytes.
+        """
+        payload = json.dumps({
+            "created": self.created,
+            "index": self.index.to_dict(),
+            "categories": list(self.results),
+            "results": {arg: data for arg, data in self.results.items()
+                        if arg not in self.file_results},
+            "files": self.file_results,
+        }, separators=(",", ":")).encode("utf-8")
+
+        data = HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(payload)) + zlib.compress(payload, 6)
+        with open(file_path, "wb") as file:
+            file.write(data)
+        return len(data)
+
+    @classmethod
+    def load(cls, file_path: str):
+        """
+        Read a snapshot file.
+
+        Args:
+            file_path (str): The path of the snapshot file.
+
+        Returns:
+            Snapshot: The loaded snapshot.
+
+        Raises:
+            SnapshotError: If the file is not a valid snapshot of this version.
+        """
+        with open(file_path, "rb") as file:
+            data = file.read()
+
+        if len(data) < HEADER.size:
+            raise SnapshotError("Not a GPOAnalyzer snapshot")
+        magic, version, size = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise SnapshotError("Not a GPOAnalyzer snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(
+                f"Unsupported snapshot version {version}, expected {SNAPSHOT_VERSION}")
+
+        # Never decompress more than the length in the header, which is
+        # itself bounded by the compressed size
+        compressed = data[HEADER.size:]
+        if not 0 < size <= len(compressed) * MAX_RATIO:
+            raise SnapshotError("Corrupted snapshot: unexpected payload size")
+        decompressor = zlib.decompressobj()
+        try:
+            payload = decompressor.decompress(compressed, size)
+        except zlib.error as e:
+            raise SnapshotError(f"Corrupted snapshot: {e}") from e
+        if len(payload) != size or decompressor.unconsumed_tail or not decompressor.eof:
+            raise SnapshotError("Corrupted snapshot: unexpected payload size")
+
+        try:
+            content = json.loads(payload.decode("utf-8"))
+            index = GPOIndex.from_dict(content["index"], PLUGINS.filenames())
+            files = content["files"]
+            results = {
+                arg: merge_file_results(arg, list(files[arg].values())) if arg in files
+                else content["results"][arg] for arg in content["categories"]}
+            return cls(results, index, created=content["created"], file_results=files)
+        except (KeyError, TypeError, ValueError) as e:
+            raise SnapshotError(f"Corrupted snapshot: {e}") from e
@@ -0,0 +1,128 @@
+"""Watch mode for GPOAnalyzer."""
+# gpoanalyzer/watch.py
+
+import json
+import sys
+import time
+
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer, merge_file_results
+
+
+class GPOWatcher:
+    """Keep parsed GPO results in memory and refresh them as files change.
+
+    The GPO directory is polled with `os.stat`, and only files whose mtime or
+    size changed since the previous poll are parsed again. Aggregated results
+    (such as `registrypol` and `gpttmpl`) are recombined from the cached per-file results.
+    """
+
+    def __init__(self, analyzer: GPOAnalyzer, user_args, interval: float = 5.0) -> None:
+        """Initialize the GPOWatcher instance.
+
+        Args:
+            analyzer (GPOAnalyzer): The analyzer used to parse changed files.
+            user_args (list): The arguments indicating which files to watch.
+            interval (float): The number of seconds between two polls.
+        """
+        self.analyzer = analyzer
+        self.interval = interval
+        self.user_args = {arg for arg in user_args if arg in analyzer.plugins}
+        # path -> (arg, mtime, size) as seen by the last poll
+        self.files = {}
+        # path -> parse_file result
+        self.file_results = {}
+        self.results = {}
+
+    def scan(self) -> dict:
+        """Index the GPO directory once and stat every watched file.
+
+        Returns:
+            dict: A dictionary mapping file paths to (arg, mtime, size) tuples.
+        """
+        index = self.analyzer.build_index()
+        return {path: (entry.category, entry.mtime_ns, entry.size)
+                for path, entry in index.files.items() if entry.category in self.user_args}
+
+    def poll(self) -> list:
+        """Re-parse the files changed since the previous poll.
+
+        Returns:
+            list: The change events, one dictionary per added, modified or
+                removed file.
+        """
+        snapshot = self.scan()
+        events = []
+        changed_args = set()
+
+        for path, (arg, _, _) in self.files.items():
+            if path not in snapshot:
+                self.file_results.pop(path, None)
+                changed_args.add(arg)
+                events.append({"event": "removed", "category": arg,
+                               "path": path, "data": None})
+
+        for path, state in snapshot.items():
+            previous = self.files.get(path)
+            if previous == state:
+                continue
+            arg = state[0]
+            data = self.analyzer.parse_file(arg, path)
+            self.file_results[path] = data
+            changed_args.add(arg)
+            events.append({"event": "modified" if previous else "added",
+                           "category": arg, "path": path, "data": data})
+
+        self.files = snapshot
+
+        # Report the files the parsers had to skip during this poll
+        for skipped in self.analyzer.skipped:
+            events.append({"event": "error", "category": skipped["category"],
+                           "path": skipped["path"], "data": skipped["reason"]})
+        self.analyzer.skipped.clear()
+
+        for arg in changed_args:
+            self.update_results(arg)
+
+        return events
+
+    def update_results(self, arg):
+        """Rebuild the in-memory results of a single argument."""
+        # Same order as `GPOIndex.category_files`: by size in descending order, then by path
+        paths = sorted((path for path, state in self.files.items() if state[0] == arg),
+                       key=lambda path: (-self.files[path][2], path))
+        file_results = [(path, self.file_results.get(path)) for path in paths]
+
+        if self.analyzer.plugins.get(arg).aggregate:
+            merged = merge_file_results(arg, [data for _, data in file_results],
+                                        self.analyzer.plugins)
+            if paths:
+                self.results[arg] = merged
+            else:
+                self.results.pop(arg, None)
+            return
+
+        parsed = [(path, data) for path, data in file_results if data is not None]
+        if parsed:
+            self.results[arg] = {path: data for path, data in parsed if data}
+        else:
+            self.results.pop(arg, None)
+
+    def run(self, stream=sys.stdout):
+        """Poll the GPO directory forever and write changes as NDJSON events.
+
+        Args:
+            stream (file): The stream the events are written to.
+        """
+        while True:
+            started = time.monotonic()
+            events = self.poll()
+            for event in events:
+                stream.write(json.dumps(event) + "\n")
+            if events:
+                stream.write(json.dumps({
+                    "event": "synced",
+                    "changed": len(events),
+                    "elapsed": round(time.monotonic() - started, 3),
+                }) + "\n")
+            stream.flush()
+            time.sleep(self.interval)
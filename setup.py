@@ -19,6 +19,7 @@ setup(
     url="https://github.com/safedv/GPOAnalyzer",
     packages=find_packages(),
     install_requires=requirements,
+    extras_require={"lxml": ["lxml>=5"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,41 @@
+"""Tests for the ADMX/ADML policy definitions index."""
+# tests/test_admx.py
+
+from gpoanalyzer.admx import PolicyIndex
+
+ADMX = """<?xml version="1.0" encoding="utf-8"?>
+<policyDefinitions xmlns="http://schemas.microsoft.com/GroupPolicy/2006/07/PolicyDefinitions">
+  <policies>
+    <policy name="Disable{product}" displayName="$(string.Disable)"
+            key="Software\\Policies\\{product}" valueName="Disabled" />
+  </policies>
+</policyDefinitions>
+"""
+
+ADML = """<?xml version="1.0" encoding="utf-8"?>
+<policyDefinitionResources
+    xmlns="http://schemas.microsoft.com/GroupPolicy/2006/07/PolicyDefinitions">
+  <resources>
+    <stringTable>
+      <string id="Disable">Disable product {product}</string>
+    </stringTable>
+  </resources>
+</policyDefinitionResources>
+"""
+
+
+def test_string_ids_resolve_against_their_own_adml(tmp_path):
+    """Two ADML files defining the same string id keep their own display names."""
+    definitions = tmp_path / "PolicyDefinitions"
+    (definitions / "en-US").mkdir(parents=True)
+    for product in ("a", "b"):
+        (definitions / f"{product}.admx").write_text(ADMX.format(product=product),
+                                                     encoding="utf-8")
+        (definitions / "en-US" / f"{product}.adml").write_text(ADML.format(product=product),
+                                                               encoding="utf-8")
+
+    index = PolicyIndex(str(definitions), cache_dir=str(tmp_path / "cache"))
+    assert index.lookup("Software\\Policies\\a", "Disabled") == [
+        "Disable product a", "Disablea", "a.admx"]
+    assert index.lookup("Software\\Policies\\b", "Disabled") == [
+        "Disable product b", "Disableb", "b.admx"]
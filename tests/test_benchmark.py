@@ -0,0 +1,51 @@
+"""Tests for the regression benchmark."""
+# tests/test_benchmark.py
+
+import json
+from pathlib import Path
+
+import pytest
+
+from gpoanalyzer.benchmark import Engines, run_benchmark
+from gpoanalyzer.generate import generate_sysvol
+from gpoanalyzer.parse import pol_files
+from gpoanalyzer.plugins import PLUGINS
+
+# Results of `python -m gpoanalyzer.benchmark SYSVOL --save-golden golden-2.json`
+# on a SYSVOL from `python -m gpoanalyzer.generate SYSVOL --gpos 2`
+GOLDEN = Path(__file__).parent / "fixtures" / "benchmark" / "golden-2.json"
+
+
+@pytest.fixture(name="engines")
+def fixture_engines(tmp_path):
+    """Return the engines of every category of the generated SYSVOL of the golden results."""
+    sysvol = str(tmp_path / "sysvol")
+    generate_sysvol(sysvol, gpos=2)
+    return Engines(sysvol, PLUGINS.names(), str(tmp_path))
+
+
+@pytest.fixture(name="golden")
+def fixture_golden():
+    """Return the stored golden results."""
+    with open(GOLDEN, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_every_engine_matches_the_golden_results(engines, golden):
+    """Every parsing path, the reference included, returns the stored results."""
+    outcomes = run_benchmark(engines, list(engines.available()), 1, golden)
+    assert [outcome.difference for outcome in outcomes] == [None] * len(outcomes)
+
+
+def test_shared_regression_is_caught(monkeypatch, engines, golden):
+    """A regression in a decoder shared by every engine differs from the golden results."""
+    decoders = dict(pol_files.DECODERS)
+    decoders["REG_DWORD_BIG_ENDIAN"] = decoders["REG_DWORD"]
+    monkeypatch.setattr(pol_files, "DECODERS", decoders)
+
+    outcomes = run_benchmark(engines, list(engines.available()), 1)
+    assert all(outcome.equal for outcome in outcomes)
+
+    outcomes = run_benchmark(engines, list(engines.available()), 1, golden)
+    assert not any(outcome.equal for outcome in outcomes)
+    assert "registrypol" in outcomes[0].difference
@@ -0,0 +1,46 @@
+"""Tests for the early stop of the searches."""
+# tests/test_find.py
+
+import pytest
+
+from gpoanalyzer import cli
+from gpoanalyzer.generate import generate_sysvol
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer
+from gpoanalyzer.search import MultiPatternMatcher
+
+
+@pytest.fixture(name="analyzer")
+def fixture_analyzer(tmp_path):
+    """Return a GPOAnalyzer of a generated SYSVOL of a single GPO."""
+    sysvol = str(tmp_path / "sysvol")
+    generate_sysvol(sysvol, gpos=1)
+    return GPOAnalyzer(sysvol)
+
+
+def test_find_stops_before_the_next_category(analyzer):
+    """Reaching max_results on the last string of a category does not parse the next one."""
+    parsed_data = analyzer.parse_lazy(["drives", "groups"])
+    # The share path is the last string of the drives category
+    matches = list(analyzer.find(parsed_data, r"\\share$", max_results=1))
+
+    assert [match.value for match in matches] == ["\\\\fs0\\share"]
+    assert "groups" not in parsed_data.computed
+
+
+def test_find_many_stops_before_the_next_category(analyzer):
+    """find_many also stops right after the match reaching max_results."""
+    parsed_data = analyzer.parse_lazy(["drives", "groups"])
+    matcher = MultiPatternMatcher(literals=["share"])
+    matches = list(analyzer.find_many(parsed_data, matcher, max_results=1))
+
+    assert [match.term for match in matches] == ["share"]
+    assert "groups" not in parsed_data.computed
+
+
+@pytest.mark.parametrize("option", [["--first"], ["--max-results", "3"]])
+def test_result_limits_require_a_search(monkeypatch, capsys, option):
+    """--first and --max-results are rejected without a search."""
+    monkeypatch.setattr("sys.argv", ["gpoanalyzer", "sysvol", "--groups"] + option)
+    with pytest.raises(SystemExit):
+        cli.app()
+    assert "require --find or --find-file" in capsys.readouterr().err
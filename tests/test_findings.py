@@ -0,0 +1,108 @@
+"""Tests for the findings rules and engine."""
+# tests/test_findings.py
+
+import pytest
+
+from gpoanalyzer.findings import FindingsEngine, compile_rules
+from gpoanalyzer.generate import generate_sysvol
+from gpoanalyzer.gpo_rules import gpo_rules
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer
+
+
+def row(key: str, value: str, data: str) -> dict:
+    """Return the rows of a Registry.pol file holding a single value."""
+    return {"0": {"name": "Registry.pol", "Hive": "HKLM", "Key": key, "Value": value,
+                  "Type": "REG_DWORD", "Data": data}}
+
+
+def system_access(**values) -> dict:
+    """Return a GptTmpl.inf file with the given [System Access] values."""
+    return {"System Access": values}
+
+
+# Rule id -> minimal data of a file matching the rule, and data that does not
+FIXTURES = {
+    "GPP-CPASSWORD": ([{"cpassword": "j1Uyj3Vx8TY9"}], [{"cpassword": ""}]),
+    "GROUPS-PRIVILEGED-MEMBERSHIP": (
+        [{"name": "Administrators (built-in)", "member": [{"name": "CORP\\user"}]}],
+        [{"name": "Users", "member": [{"name": "CORP\\user"}]}]),
+    "GROUPS-ACCOUNT-NEVER-EXPIRES": ([[{"neverExpires": "1"}]], [[{"neverExpires": "0"}]]),
+    "TASK-PRIVILEGED-PRINCIPAL": ([{"runAs": "NT AUTHORITY\\SYSTEM"}], [{"runAs": "CORP\\svc"}]),
+    "TASK-UNC-COMMAND": ([{"command": "\\\\srv\\share\\run.exe"}],
+                         [{"command": "C:\\Windows\\run.exe"}]),
+    "DRIVE-STORED-USERNAME": ([{"userName": "svc_backup"}], [{"userName": ""}]),
+    "REG-ALWAYS-INSTALL-ELEVATED": (
+        row("Software\\Policies\\Microsoft\\Windows\\Installer", "AlwaysInstallElevated",
+            "0x00000001"),
+        row("Software\\Policies\\Microsoft\\Windows\\Installer", "AlwaysInstallElevated",
+            "0x00000000")),
+    "REG-WDIGEST-CLEARTEXT": (
+        row("System\\CurrentControlSet\\Control\\SecurityProviders\\WDigest",
+            "UseLogonCredential", "0x00000001"),
+        row("System\\CurrentControlSet\\Control\\SecurityProviders\\WDigest",
+            "Negotiate", "0x00000001")),
+    "REG-AUTOLOGON-PASSWORD": (
+        row("Software\\Microsoft\\Windows NT\\CurrentVersion\\Winlogon", "DefaultPassword",
+            "secret"),
+        row("Software\\Microsoft\\Windows NT\\CurrentVersion\\Winlogon", "DefaultUserName",
+            "admin")),
+    "INF-CLEARTEXT-PASSWORD": (system_access(ClearTextPassword="1"),
+                               system_access(ClearTextPassword="0")),
+    "INF-SHORT-PASSWORD": (system_access(MinimumPasswordLength="8"),
+                           system_access(MinimumPasswordLength="14")),
+    "INF-NO-COMPLEXITY": (system_access(PasswordComplexity="0"),
+                          system_access(PasswordComplexity="1")),
+    "INF-NO-LOCKOUT": (system_access(LockoutBadCount="0"), system_access(LockoutBadCount="5")),
+    "INF-ANONYMOUS-SID-LOOKUP": (system_access(LSAAnonymousNameLookup="1"),
+                                 system_access(LSAAnonymousNameLookup="0")),
+}
+
+RULES = [(category, rule) for category, rules in gpo_rules.items() for rule in rules]
+
+
+def test_every_rule_has_a_fixture():
+    """New rules come with a fixture."""
+    assert {rule["id"] for _, rule in RULES} == set(FIXTURES)
+
+
+@pytest.mark.parametrize("category, rule", RULES, ids=[rule["id"] for _, rule in RULES])
+def test_rule_fires_on_its_fixture_only(category, rule):
+    """Each rule reports the matching data and ignores the near miss."""
+    matching, other = FIXTURES[rule["id"]]
+    engine = FindingsEngine({category: [rule]})
+    engine.evaluate(category, other, "source")
+    assert not engine.findings
+
+    engine.evaluate(category, matching, "source")
+    assert [finding["id"] for finding in engine.findings] == [rule["id"]]
+    assert engine.findings[0]["field"] == next(iter(rule["match"]))
+
+
+@pytest.mark.parametrize("rules", [
+    {"unknown": []},
+    {"groups": [{"id": "X", "title": "X", "severity": "critical", "match": {}}]},
+    {"groups": [{"id": "X", "title": "X", "severity": "low", "match": {"sid": {"present": 1}}}]},
+    {"groups": [{"id": "X", "title": "X", "severity": "low",
+                 "match": {"name": {"contains": "x"}}}]},
+])
+def test_invalid_rules_are_rejected(rules):
+    """Unknown categories, severities, conditions and unextracted fields are errors."""
+    with pytest.raises(ValueError):
+        compile_rules(rules)
+
+
+def test_findings_of_a_generated_sysvol(tmp_path):
+    """Findings are evaluated while parsing and attributed to their source file."""
+    sysvol = str(tmp_path / "sysvol")
+    generate_sysvol(sysvol, gpos=2)
+    analyzer = GPOAnalyzer(sysvol)
+    analyzer.findings = FindingsEngine()
+    analyzer.parse(analyzer.plugins.names())
+
+    findings = analyzer.findings.sorted_findings()
+    assert {finding["id"] for finding in findings} >= {
+        "GPP-CPASSWORD", "REG-ALWAYS-INSTALL-ELEVATED", "INF-CLEARTEXT-PASSWORD",
+        "DRIVE-STORED-USERNAME", "INF-NO-LOCKOUT"}
+    assert findings[0]["severity"] == "high"
+    cpassword = next(finding for finding in findings if finding["id"] == "GPP-CPASSWORD")
+    assert cpassword["source"].endswith("Groups.xml")
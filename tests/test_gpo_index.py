@@ -0,0 +1,64 @@
+"""Tests for the GPO discovery index."""
+# tests/test_gpo_index.py
+
+import os
+
+import pytest
+
+from gpoanalyzer.generate import generate_sysvol
+from gpoanalyzer.gpo_index import GPOIndex
+from gpoanalyzer.plugins import PLUGINS
+
+
+@pytest.fixture(name="sysvol")
+def fixture_sysvol(tmp_path):
+    """Return the path of a generated SYSVOL of three GPOs."""
+    sysvol = str(tmp_path / "sysvol")
+    generate_sysvol(sysvol, gpos=3)
+    return sysvol
+
+
+def build_index(sysvol: str, selection=None) -> GPOIndex:
+    """Build the index of a SYSVOL for every plugin file."""
+    index = GPOIndex(sysvol, PLUGINS.filenames(), selection)
+    index.build()
+    return index
+
+
+def test_all_gpos_are_indexed_without_selection(sysvol):
+    """Every GPO is indexed, with its display name, files and scopes."""
+    index = build_index(sysvol)
+    assert sorted(gpo.display_name for gpo in index.gpos.values()) == [
+        "Policy 0", "Policy 1", "Policy 2"]
+    assert len(index.files) == 3 * 5
+    gpo = next(iter(index.gpos.values()))
+    assert set(gpo.files["drives"].values()) == {"User"}
+    assert set(gpo.files["registrypol"].values()) == {"Machine"}
+
+
+@pytest.mark.parametrize("by", ["guid", "name"])
+def test_selection_prunes_other_gpos(monkeypatch, sysvol, by):
+    """Selecting a GPO by GUID or display name never walks the other GPOs."""
+    gpos = build_index(sysvol).gpos.values()
+    selected = next(gpo for gpo in gpos if gpo.display_name == "Policy 1")
+    others = [gpo.path for gpo in gpos if gpo is not selected]
+    # GUIDs are matched without braces and names case-insensitively
+    item = selected.guid.strip("{}").lower() if by == "guid" else "POLICY 1"
+
+    walked = []
+    walk = os.walk
+
+    def recording_walk(top):
+        for root, dirs, files in walk(top):
+            walked.append(root)
+            yield root, dirs, files
+
+    monkeypatch.setattr(os, "walk", recording_walk)
+    index = build_index(sysvol, [item])
+
+    assert list(index.gpos) == [selected.guid]
+    assert {entry.guid for entry in index.files.values()} == {selected.guid}
+    assert len(index.files) == 5
+    # The folders of the other GPOs are reached, but nothing below them
+    assert not [root for root in walked for path in others
+                if root.startswith(path + os.sep)]
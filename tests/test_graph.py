@@ -0,0 +1,78 @@
+"""Tests for the graph export."""
+# tests/test_graph.py
+
+import csv
+import io
+import json
+
+import pytest
+
+from gpoanalyzer.generate import generate_sysvol
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer
+from gpoanalyzer.graph import GraphWriter, export_graph
+
+
+@pytest.fixture(name="analyzer")
+def fixture_analyzer(tmp_path):
+    """Return a GPOAnalyzer of a single GPO with two members and two tasks."""
+    sysvol = str(tmp_path / "sysvol")
+    generate_sysvol(sysvol, gpos=1, members=2, tasks=2)
+    return GPOAnalyzer(sysvol)
+
+
+def export(analyzer: GPOAnalyzer, graph_format: str) -> str:
+    """Export the graph of the analyzer and return the written text."""
+    stream = io.StringIO()
+    export_graph(analyzer, GraphWriter(stream, graph_format))
+    return stream.getvalue()
+
+
+def test_csv_edges(analyzer):
+    """The CSV export is an edge list with a header."""
+    rows = list(csv.reader(io.StringIO(export(analyzer, "csv"))))
+    gpo = analyzer.index.gpos[next(iter(analyzer.index.gpos))]
+    gpo_id = f"gpo:{gpo.guid}"
+    groups, tasks = (next(iter(gpo.files[category])) for category in ("groups", "scheduledtasks"))
+    group = "group:Administrators (built-in)"
+
+    assert rows == [
+        ["source", "target", "relation", "gpo", "action", "path"],
+        [gpo_id, group, "configures", gpo_id, "", groups],
+        ["principal:CORP\\user0", group, "member_of", gpo_id, "ADD", groups],
+        ["principal:CORP\\user1", group, "member_of", gpo_id, "ADD", groups],
+        [gpo_id, f"task:{gpo_id}:task0-0", "configures", gpo_id, "C", tasks],
+        [f"task:{gpo_id}:task0-0", "principal:CORP\\svc", "runs_as", gpo_id, "S4U", tasks],
+        [gpo_id, f"task:{gpo_id}:task0-1", "configures", gpo_id, "C", tasks],
+        [f"task:{gpo_id}:task0-1", "principal:NT AUTHORITY\\System", "runs_as", gpo_id,
+         "S4U", tasks],
+    ]
+
+
+def test_ndjson_nodes_and_edges(analyzer):
+    """The NDJSON export has the same edges, and each node once per file before its edges."""
+    records = [json.loads(line) for line in export(analyzer, "ndjson").splitlines()]
+    nodes = [record for record in records if record["type"] == "node"]
+    edges = [record for record in records if record["type"] == "edge"]
+
+    csv_edges = list(csv.reader(io.StringIO(export(analyzer, "csv"))))[1:]
+    assert [[edge["source"], edge["target"], edge["relation"]] for edge in edges] == [
+        row[:3] for row in csv_edges]
+
+    gpo = next(node for node in nodes if node["kind"] == "gpo")
+    assert gpo["name"] == "Policy 0"
+    assert next(node for node in nodes if node["name"] == "CORP\\user1")["sid"] == "S-1-5-21-1-1"
+    # The GPO node is written once for each of its two files
+    assert [node["id"] for node in nodes].count(gpo["id"]) == 2
+
+    written = set()
+    for record in records:
+        if record["type"] == "node":
+            written.add(record["id"])
+        else:
+            assert {record["source"], record["target"]} <= written
+
+
+def test_invalid_format_is_rejected():
+    """Only the CSV and NDJSON formats are supported."""
+    with pytest.raises(ValueError):
+        GraphWriter(io.StringIO(), "graphml")
@@ -0,0 +1,95 @@
+"""Tests for the parser limits on malformed and oversized files."""
+# tests/test_limits.py
+
+import itertools
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+from gpoanalyzer.generate import pol_file
+from gpoanalyzer.parse import limits
+from gpoanalyzer.parse.limits import ParseLimits
+from gpoanalyzer.parse.pol_files import POLParser
+
+ENTRIES = [
+    ("Software\\Corp", "Name", 1, "one\0".encode("utf-16le")),
+    ("Software\\Corp", "Enabled", 4, struct.pack("<I", 1)),
+]
+
+# Offset of the size field of the first entry, after the header
+SIZE_OFFSET = len(b"PReg\x01\x00\x00\x00" + "[Software\\Corp\0;Name\0;".encode("utf-16le")) + 6
+
+
+def parse_bytes(tmp_path, content: bytes, parse_limits: ParseLimits = None):
+    """Parse a Registry.pol file with the given content, return the parser."""
+    folder = tmp_path / "Machine"
+    folder.mkdir(exist_ok=True)
+    (folder / "Registry.pol").write_bytes(content)
+    parser = POLParser(parse_limits)
+    parser.parse([str(folder / "Registry.pol")])
+    return parser
+
+
+def with_size(size: int) -> bytes:
+    """Return the entries with the size field of the first entry replaced."""
+    content = pol_file(ENTRIES)
+    return content[:SIZE_OFFSET] + struct.pack("<I", size) + content[SIZE_OFFSET + 4:]
+
+
+def test_size_offset_points_at_the_size_field(tmp_path):
+    """The unmodified size keeps the file valid."""
+    parser = parse_bytes(tmp_path, with_size(len(ENTRIES[0][3])))
+    assert len(parser.results) == 2 and not parser.skipped
+
+
+def test_every_truncation_is_reported(tmp_path):
+    """A file cut anywhere inside an entry is skipped with a reason, never hangs."""
+    content = pol_file(ENTRIES)
+    # Entries end right after each "]"
+    complete = {8, len(pol_file(ENTRIES[:1])), len(content)}
+    for length in range(8, len(content) + 1):
+        parser = parse_bytes(tmp_path, content[:length])
+        if length in complete:
+            assert not parser.skipped
+        else:
+            assert len(parser.skipped) == 1, length
+            assert not parser.results
+
+
+@pytest.mark.parametrize("size, reason", [
+    (0, "Entry not closed after its data"),
+    (4, "Entry not closed after its data"),
+    (2 ** 32 - 1, "exceeds the file"),
+])
+def test_wrong_data_size_is_reported(tmp_path, size, reason):
+    """A size that does not match the data skips the file instead of misreading it."""
+    parser = parse_bytes(tmp_path, with_size(size))
+    assert not parser.results
+    assert reason in parser.skipped[0][1]
+
+
+def test_empty_data_is_valid(tmp_path):
+    """An entry with no data is a value, not a parser error."""
+    parser = parse_bytes(tmp_path, pol_file([("Software\\Corp", "Empty", 1, b"")]))
+    assert [row["Data"] for row in parser.results.values()] == [""]
+    assert not parser.skipped
+
+
+def test_byte_budget_skips_larger_files(tmp_path):
+    """Files over the byte budget are skipped before being read."""
+    content = pol_file(ENTRIES)
+    parser = parse_bytes(tmp_path, content, ParseLimits(max_bytes=len(content) - 1))
+    assert not parser.results
+    assert "exceeds the budget" in parser.skipped[0][1]
+    assert not parse_bytes(tmp_path, content, ParseLimits(max_bytes=len(content))).skipped
+
+
+def test_time_budget_stops_parsing(tmp_path, monkeypatch):
+    """A file taking longer than the time budget is skipped."""
+    # Every clock reading is ten seconds after the previous one
+    clock = itertools.count(0, 10.0)
+    monkeypatch.setattr(limits, "time", SimpleNamespace(monotonic=lambda: next(clock)))
+    parser = parse_bytes(tmp_path, pol_file(ENTRIES), ParseLimits(max_seconds=5))
+    assert not parser.results
+    assert "Time budget of 5s exceeded" in parser.skipped[0][1]
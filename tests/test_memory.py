@@ -0,0 +1,30 @@
+"""Tests for the memory usage of parsing."""
+# tests/test_memory.py
+
+from gpoanalyzer.generate import generate_sysvol
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer
+from gpoanalyzer.memory import MemoryProfiler
+
+# Peak memory allowed to parse all the files of a generated SYSVOL of 100
+# GPOs (about 1 MB on disk), in bytes
+PARSE_BUDGET = 16 * 2 ** 20
+
+
+def test_parse_peak_memory_within_budget(tmp_path):
+    """Parsing every supported file of a generated SYSVOL stays within the budget."""
+    sysvol = str(tmp_path / "sysvol")
+    generate_sysvol(sysvol, gpos=100)
+    analyzer = GPOAnalyzer(sysvol)
+
+    profiler = MemoryProfiler(top=0)
+    profiler.start()
+    try:
+        with profiler.phase("parse"):
+            results = analyzer.parse(analyzer.plugins.names())
+    finally:
+        profiler.stop()
+
+    assert set(results) >= {"groups", "scheduledtasks", "registrypol"}
+    assert profiler.peak < PARSE_BUDGET, (
+        f"parsing peaked at {profiler.peak / 2 ** 20:.2f} MB, "
+        f"over the budget of {PARSE_BUDGET / 2 ** 20:.0f} MB")
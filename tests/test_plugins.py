@@ -0,0 +1,52 @@
+"""Tests for the parser plugin registry."""
+# tests/test_plugins.py
+
+from types import SimpleNamespace
+
+import pytest
+
+from gpoanalyzer import cli, plugins
+from gpoanalyzer.findings import FindingsEngine
+from gpoanalyzer.plugins import ParserPlugin, ParserRegistry
+
+FDEPLOY = ParserPlugin("fdeploy", ("fdeploy.ini",), "Extract folder redirection settings",
+                       parser="gpoanalyzer.parse.ini_files:ScriptsParser",
+                       fields=("folder", "path"))
+
+
+@pytest.mark.parametrize("name", ["json", "find_file", "output", "host", "gpo", "watch"])
+def test_plugin_named_after_an_option_is_recorded_in_errors(monkeypatch, name):
+    """An entry point plugin named after an option is skipped and recorded."""
+    entry_point = SimpleNamespace(name=name, load=lambda: FDEPLOY._replace(name=name))
+    monkeypatch.setattr(plugins, "iter_entry_points", lambda group: [entry_point])
+    monkeypatch.setattr(cli, "PLUGINS", ParserRegistry(plugins.BUILTIN_PLUGINS))
+
+    parser = cli.parse_cmdline()
+    assert name not in cli.PLUGINS
+    assert cli.PLUGINS.errors == [(name, f"Reserved parser plugin name: {name}")]
+    assert parser.parse_args(["sysvol", "--registrypol"]).registrypol
+
+
+def test_reserve_drops_registered_plugins():
+    """Reserving the name of a registered plugin removes it from the registry."""
+    registry = ParserRegistry([FDEPLOY], group=None)
+    registry.reserve(["fdeploy"])
+    assert "fdeploy" not in registry
+    assert registry.errors == [("fdeploy", "Reserved parser plugin name: fdeploy")]
+    with pytest.raises(ValueError):
+        registry.register(FDEPLOY)
+
+
+def test_plugin_category_findings_rules():
+    """Findings rules apply to plugin categories, on their listed fields only."""
+    registry = ParserRegistry([FDEPLOY], group=None)
+    rule = {"id": "FDEPLOY-001", "title": "Redirected to a share", "severity": "info",
+            "match": {"path": {"regex": r"^\\\\"}}}
+    engine = FindingsEngine({"fdeploy": [rule]}, plugins=registry)
+    engine.evaluate("fdeploy", [[{"folder": "Desktop", "path": "\\\\srv\\desktop"},
+                                 {"folder": "Music", "path": "C:\\Music"}]], "fdeploy.ini")
+    assert [finding["value"] for finding in engine.findings] == ["\\\\srv\\desktop"]
+
+    with pytest.raises(ValueError):
+        FindingsEngine({"fdeploy": [dict(rule, match={"user": {"equals": "x"}})]},
+                       plugins=registry)
@@ -0,0 +1,118 @@
+"""Tests for the Registry.pol parser."""
+# tests/test_pol_files.py
+
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from gpoanalyzer.generate import pol_file
+from gpoanalyzer.parse.pol_files import POLParser
+
+FIXTURES = Path(__file__).parent / "fixtures" / "pol"
+
+
+def sz(text: str) -> bytes:
+    """Encode a null terminated string as stored in Registry.pol data."""
+    return (text + "\0").encode("utf-16le")
+
+
+def write_pol(tmp_path, entries, name: str = "Machine") -> str:
+    """Write a Registry.pol file of the given entries in a scope folder."""
+    folder = tmp_path / name
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "Registry.pol").write_bytes(pol_file(entries))
+    return str(folder / "Registry.pol")
+
+
+def parse_rows(*file_paths) -> dict:
+    """Parse Registry.pol files and return a dictionary of their rows by value name."""
+    return {row["Value"]: row for row in POLParser().parse(file_paths).values()}
+
+
+def test_output_matches_the_previous_parser(tmp_path):
+    """The types the previous parser decoded are decoded the same way."""
+    (tmp_path / "Machine").mkdir()
+    file_path = str(tmp_path / "Machine" / "Registry.pol")
+    shutil.copy(str(FIXTURES / "Registry.pol"), file_path)
+
+    rows = list(POLParser().parse([file_path]).values())
+    for row in rows:
+        assert row.pop("name") == file_path
+
+    expected = json.loads((FIXTURES / "Registry.json").read_text(encoding="utf-8"))
+    assert rows == expected
+
+
+def test_integer_types(tmp_path):
+    """DWORD, big-endian DWORD and QWORD data is formatted most significant byte first."""
+    rows = parse_rows(write_pol(tmp_path, [
+        ("Software\\Corp", "Dword", 4, struct.pack("<I", 0x01020304)),
+        ("Software\\Corp", "BigEndian", 5, struct.pack(">I", 0x01020304)),
+        ("Software\\Corp", "Qword", 11, struct.pack("<Q", 2 ** 40 + 5)),
+        ("Software\\Corp", "ShortQword", 11, b"\x01\x02"),
+    ]))
+    assert {value: row["Data"] for value, row in rows.items()} == {
+        "Dword": "0x01020304",
+        "BigEndian": "0x01020304",
+        "Qword": "0x0000010000000005",
+        "ShortQword": "0x0201",
+    }
+    assert rows["Qword"]["Type"] == "REG_QWORD"
+    assert rows["BigEndian"]["Type"] == "REG_DWORD_BIG_ENDIAN"
+
+
+def test_string_types(tmp_path):
+    """Multi-strings keep their separators, links and surrogate pairs are decoded."""
+    rows = parse_rows(write_pol(tmp_path, [
+        ("Software\\Corp", "Servers", 7, "srv1\0srv2\0\0".encode("utf-16le")),
+        ("Software\\Corp", "Link", 6, sz("\\Registry\\Machine\\Software\\Target")),
+        ("Software\\Corp", "Emoji", 1, sz("key \U0001F511")),
+    ]))
+    assert rows["Servers"]["Data"] == "srv1\0srv2"
+    assert rows["Link"]["Type"] == "REG_LINK"
+    assert rows["Link"]["Data"] == "\\Registry\\Machine\\Software\\Target"
+    assert rows["Emoji"]["Data"] == "key \U0001F511"
+
+
+def test_invalid_string_data_skips_its_file_only(tmp_path):
+    """A file with a lone surrogate in string data is skipped, the others are kept."""
+    valid = write_pol(tmp_path, [("Software\\Corp", "Valid", 1, sz("ok"))], "Machine")
+    invalid = write_pol(tmp_path, [
+        ("Software\\Corp", "Before", 1, sz("fine")),
+        ("Software\\Corp", "Broken", 1, b"\x00\xd8a\x00\x00\x00"),
+    ], "User")
+
+    parser = POLParser()
+    rows = parser.parse([valid, invalid])
+    assert [row["Value"] for row in rows.values()] == ["Valid"]
+    assert [file_path for file_path, _ in parser.skipped] == [invalid]
+    assert parser.skipped[0][1].startswith("Invalid string data")
+
+
+def test_row_keys_are_the_same_in_every_process():
+    """Row keys do not depend on the hash randomization of the process."""
+    script = ("import json, sys; from gpoanalyzer.parse.pol_files import POLParser; "
+              "print(json.dumps(list(POLParser().parse([sys.argv[1]]))))")
+    outputs = set()
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        outputs.add(subprocess.run(
+            [sys.executable, "-c", script, str(FIXTURES / "Registry.pol")],
+            check=True, capture_output=True, text=True, env=env,
+            cwd=str(Path(__file__).parent.parent)).stdout)
+    assert len(outputs) == 1
+
+
+@pytest.mark.parametrize("reg_type, data", [(1, sz("same")), (4, struct.pack("<I", 1))])
+def test_duplicate_rows_share_a_key(tmp_path, reg_type, data):
+    """Rows with the same key, value name and data are reported once."""
+    entry = ("Software\\Corp", "Duplicate", reg_type, data)
+    machine = write_pol(tmp_path, [entry], "Machine")
+    user = write_pol(tmp_path, [entry], "User")
+    assert len(POLParser().parse([machine, user])) == 1
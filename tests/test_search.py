@@ -0,0 +1,42 @@
+"""Tests for the multi-pattern search helpers."""
+# tests/test_search.py
+
+from gpoanalyzer.search import MultiPatternMatcher, load_patterns
+
+
+def test_literals_and_patterns_in_load_order():
+    """Literal and regex terms are reported in load order."""
+    matcher = MultiPatternMatcher(literals=["admin", "svc"], patterns=[r"\d{3}", "^svc"])
+    assert matcher.match("svc_admin_123") == ["admin", "svc", r"re:\d{3}", "re:^svc"]
+    assert not matcher.match("nothing here")
+
+
+def test_backreferences_are_not_renumbered():
+    """A backreference keeps pointing at the group of its own pattern."""
+    matcher = MultiPatternMatcher(patterns=[r"(a)\1", r"(b)\1"])
+    assert matcher.match("bb") == [r"re:(b)\1"]
+    assert matcher.match("aa") == [r"re:(a)\1"]
+    assert not matcher.match("ab")
+
+
+def test_patterns_may_reuse_group_names():
+    """Patterns defining the same named group can be loaded together."""
+    matcher = MultiPatternMatcher(patterns=["(?P<user>admin)", "(?P<user>guest)"])
+    assert matcher.match("guest") == ["re:(?P<user>guest)"]
+
+
+def test_patterns_may_use_global_inline_flags(tmp_path):
+    """Patterns starting with a global inline flag load from a patterns file."""
+    patterns_file = tmp_path / "patterns.txt"
+    patterns_file.write_text("re:(?s)begin.end\nre:(?x) pass word\nre:token\n", encoding="utf-8")
+    matcher = load_patterns(str(patterns_file))
+    assert matcher.match("begin\nend") == ["re:(?s)begin.end"]
+    assert matcher.match("PASSWORD token") == ["re:(?x) pass word", "re:token"]
+
+
+def test_flags_without_effect_stay_out_of_the_prefilter():
+    """A global flag that leaves the flags unchanged is not spliced into the prefilter."""
+    matcher = MultiPatternMatcher(patterns=["(?u)admin", "guest"])
+    assert matcher.prefiltered == {"guest"}
+    assert matcher.match("Administrator") == ["re:(?u)admin"]
+    assert matcher.match("guest") == ["re:guest"]
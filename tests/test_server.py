@@ -0,0 +1,72 @@
+"""Tests for the local query server."""
+# tests/test_server.py
+
+import os
+import shutil
+
+import pytest
+
+from gpoanalyzer.generate import generate_sysvol
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer
+from gpoanalyzer.server import GPOQueryServer
+
+
+@pytest.fixture(name="sysvol")
+def fixture_sysvol(tmp_path):
+    """Return the path of a generated SYSVOL of two GPOs."""
+    sysvol = str(tmp_path / "sysvol")
+    generate_sysvol(sysvol, gpos=2)
+    return sysvol
+
+
+@pytest.fixture(name="server")
+def fixture_server(sysvol):
+    """Return a query server of the groups, drives and GptTmpl.inf files."""
+    return GPOQueryServer(GPOAnalyzer(sysvol), ["groups", "drives", "gpttmpl"])
+
+
+def test_categories(server):
+    """The loaded categories are listed with their entry counts."""
+    assert server.handle("GET", "/categories") == (200, {"groups": 2, "drives": 2, "gpttmpl": 3})
+
+
+def test_find(server):
+    """Find returns the matching strings with their position, up to max."""
+    status, matches = server.handle("GET", "/find?q=fs1%5C%5Cshare")
+    assert status == 200
+    assert [match["value"] for match in matches] == ["\\\\fs1\\share"]
+    assert matches[0]["path"][0] == "drives"
+
+    status, matches = server.handle("GET", "/find?q=administrators&max=1")
+    assert status == 200 and len(matches) == 1
+
+
+@pytest.mark.parametrize("query", ["/find?q=%28unclosed", "/find?q=x&max=many", "/find"])
+def test_bad_find_query_is_a_client_error(server, query):
+    """A bad regex, a bad max or a missing pattern is answered with a 400."""
+    status, body = server.handle("GET", query)
+    assert status == 400 and "error" in body
+
+
+def test_gpo_lists_every_category_by_file(server):
+    """A GPO answers with its files of every category, aggregated ones included."""
+    guid = next(iter(server.state.index.gpos))
+    status, body = server.handle("GET", "/gpo/" + guid.strip("{}").lower())
+    assert status == 200
+    assert set(body) == {"groups", "drives", "gpttmpl"}
+    for files in body.values():
+        assert all(guid in file_path for file_path in files)
+    assert server.handle("GET", "/gpo/{00000000-0000-0000-0000-000000000000}")[0] == 404
+
+
+def test_reload_picks_up_new_files(server, sysvol):
+    """POST /reload parses the GPO directory again."""
+    gpo_path = next(iter(server.state.index.gpos.values())).path
+    copy = os.path.join(sysvol, "Policies", "{11111111-2222-3333-4444-555555555555}")
+    shutil.copytree(gpo_path, copy)
+    assert server.handle("GET", "/categories")[1]["drives"] == 2
+
+    status, body = server.handle("POST", "/reload")
+    assert status == 200 and body["categories"] == ["groups", "drives", "gpttmpl"]
+    assert server.handle("GET", "/categories")[1]["drives"] == 3
+    assert server.handle("GET", "/gpo/11111111-2222-3333-4444-555555555555")[0] == 200
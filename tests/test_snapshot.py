@@ -0,0 +1,53 @@
+"""Tests for the result snapshots."""
+# tests/test_snapshot.py
+
+import json
+import zlib
+
+import pytest
+
+from gpoanalyzer.generate import generate_sysvol
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer
+from gpoanalyzer.memory import MemoryProfiler
+from gpoanalyzer.snapshot import HEADER, MAGIC, SNAPSHOT_VERSION, Snapshot, SnapshotError
+
+
+def test_round_trip_matches_the_live_parse(tmp_path):
+    """A saved and loaded snapshot holds the results and index of a live parse."""
+    sysvol = str(tmp_path / "sysvol")
+    generate_sysvol(sysvol, gpos=3)
+    analyzer = GPOAnalyzer(sysvol)
+    user_args = analyzer.plugins.names()
+    live = analyzer.parse(user_args)
+
+    snapshot_path = str(tmp_path / "domain.gposnap")
+    Snapshot.capture(GPOAnalyzer(sysvol), user_args).save(snapshot_path)
+    loaded = Snapshot.load(snapshot_path)
+
+    # Compared once converted to JSON, like the results are exported
+    assert loaded.results == json.loads(json.dumps(live))
+    assert set(loaded.results) >= {"groups", "registrypol", "gpttmpl"}
+    assert loaded.index.to_dict() == analyzer.index.to_dict()
+
+
+def write_snapshot(path, size: int, payload: bytes):
+    """Write a snapshot file with the given header length and payload."""
+    path.write_bytes(HEADER.pack(MAGIC, SNAPSHOT_VERSION, size) + zlib.compress(payload, 9))
+    return str(path)
+
+
+@pytest.mark.parametrize("declared", [16, 0, 2 ** 40])
+def test_payload_not_matching_the_header_is_rejected(tmp_path, declared):
+    """A payload expanding past the length in the header is never fully decompressed."""
+    # 64 MB of zeros, compressed to about 64 KB
+    bomb = write_snapshot(tmp_path / "bomb.gposnap", declared, bytes(64 * 2 ** 20))
+
+    profiler = MemoryProfiler(top=0)
+    profiler.start()
+    try:
+        with profiler.phase("load"):
+            with pytest.raises(SnapshotError, match="unexpected payload size"):
+                Snapshot.load(bomb)
+    finally:
+        profiler.stop()
+    assert profiler.peak < 4 * 2 ** 20
@@ -0,0 +1,80 @@
+"""Tests for the watch mode."""
+# tests/test_watch.py
+
+import io
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from gpoanalyzer import watch
+from gpoanalyzer.generate import generate_sysvol
+from gpoanalyzer.gpoanalyzer import GPOAnalyzer
+from gpoanalyzer.watch import GPOWatcher
+
+
+class StopWatching(Exception):
+    """Raised instead of sleeping, to end the watch loop after one poll."""
+
+
+def stop_watching(_seconds):
+    """Replace `time.sleep` in the watch loop."""
+    raise StopWatching
+
+
+@pytest.fixture(name="watcher")
+def fixture_watcher(tmp_path):
+    """Return a watcher of the drives and Registry.pol files, after its first poll."""
+    sysvol = str(tmp_path / "sysvol")
+    generate_sysvol(sysvol, gpos=2)
+    watcher = GPOWatcher(GPOAnalyzer(sysvol), ["drives", "registrypol"], interval=0)
+    assert [event["event"] for event in watcher.poll()] == ["added"] * 4
+    return watcher
+
+
+def touch(file_path: str, content: bytes):
+    """Rewrite a file with a later modification time."""
+    with open(file_path, "wb") as file:
+        file.write(content)
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_modified_file_emits_one_event(monkeypatch, watcher):
+    """Rewriting a file emits a single modified event with its new data, then synced."""
+    drives = next(path for path, state in watcher.files.items() if state[0] == "drives")
+    with open(drives, "rb") as file:
+        content = file.read()
+    touch(drives, content.replace(b"svc_backup", b"svc_restore"))
+
+    monkeypatch.setattr(watch, "time", SimpleNamespace(monotonic=time.monotonic,
+                                                       sleep=stop_watching))
+    stream = io.StringIO()
+    with pytest.raises(StopWatching):
+        watcher.run(stream)
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [event["event"] for event in events] == ["modified", "synced"]
+    assert events[0]["path"] == drives
+    assert events[0]["data"][0]["userName"] == "svc_restore"
+    assert events[1]["changed"] == 1
+    assert watcher.results["drives"][drives] == events[0]["data"]
+
+
+def test_unchanged_files_are_not_parsed_again(monkeypatch, watcher):
+    """A poll without changes parses nothing and emits no event."""
+    monkeypatch.setattr(watcher.analyzer, "parse_file", None)
+    assert not watcher.poll()
+
+
+def test_aggregated_results_follow_removed_files(watcher):
+    """Removing a Registry.pol file removes its rows from the merged results."""
+    pol_files = [path for path, state in watcher.files.items() if state[0] == "registrypol"]
+    rows = len(watcher.results["registrypol"])
+    os.remove(pol_files[0])
+
+    assert [event["event"] for event in watcher.poll()] == ["removed"]
+    assert 0 < len(watcher.results["registrypol"]) < rows
+    assert all(row["name"] == pol_files[1] for row in watcher.results["registrypol"].values())
@@ -0,0 +1,50 @@
+"""Tests for the XML parser and its backends."""
+# tests/test_xml_files.py
+
+import json
+from pathlib import Path
+
+import pytest
+
+from gpoanalyzer.parse.limits import ParserError
+from gpoanalyzer.parse.xml_files import XMLParser, lxml_etree
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "xml").glob("*.xml"))
+
+BACKENDS = ["stdlib", pytest.param("lxml", marks=pytest.mark.skipif(
+    lxml_etree is None, reason="lxml is not installed"))]
+
+
+def expected_output(fixture: Path) -> dict:
+    """Return the expected output of a fixture, stored next to it."""
+    return json.loads(fixture.with_suffix(".json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda fixture: fixture.name)
+def test_backends_produce_the_expected_output(fixture, backend):
+    """Every backend builds the expected dictionaries."""
+    assert XMLParser(backend=backend).parse(str(fixture)) == expected_output(fixture)
+
+
+def test_auto_backend_is_stdlib():
+    """The automatic backend is the standard library, the fastest of the two."""
+    assert XMLParser().backend == "stdlib"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_external_entities_are_not_resolved(tmp_path, backend):
+    """An external entity never pulls the content of another file into the output."""
+    secret = tmp_path / "secret.txt"
+    secret.write_text("SECRET", encoding="utf-8")
+    document = tmp_path / "Groups.xml"
+    document.write_text(
+        '<?xml version="1.0"?>\n'
+        f'<!DOCTYPE Groups [<!ENTITY leak SYSTEM "{secret.as_uri()}">]>\n'
+        '<Groups><Group>&leak;</Group></Groups>\n', encoding="utf-8")
+
+    try:
+        result = XMLParser(backend=backend).parse(str(document))
+    except ParserError:
+        return
+    assert "SECRET" not in json.dumps(result)